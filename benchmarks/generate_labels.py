@@ -0,0 +1,169 @@
+"""
+Generate synthetic Client Track "Happy Birthday!" label exports for
+benchmarking the Birthday Bag Exporter pipeline.
+
+Example:
+    python benchmarks/generate_labels.py --labels 10000 --output labels_10k.xlsx
+"""
+import argparse
+import hashlib
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from birthday_bag_exporter import DEFAULT_ROUTE_ASSIGNMENTS  # noqa: E402
+
+# Largest number of rows an .xlsx worksheet can hold
+MAX_SHEET_ROWS = 1048576
+
+LAYOUTS = ('compact', 'wide', 'mixed', 'sparse')
+
+FIRST_NAMES = ['Maria', 'James', 'Rosa', 'David', 'Linda', 'Jose', 'Patricia', 'Robert', 'Ana', 'Michael', 'Carmen', 'Daniel']
+LAST_NAMES = ['Garcia', 'Smith', 'Hernandez', 'Johnson', 'Lopez', 'Williams', 'Martinez', 'Brown', 'Nguyen', 'Kim', 'Davis', 'Rivera']
+STREETS = ['Main St', 'Figueroa St', 'Sunset Blvd', 'Vermont Ave', 'Olympic Blvd', 'Pico Blvd', 'Western Ave']
+CITIES = ['Los Angeles, CA', 'Pasadena, CA', 'Long Beach, CA', 'Lancaster, CA', 'South Gate, CA']
+
+# Decorations Client Track adds around route names
+DECORATIONS = ['', '', '', ' [FULL]', ' (AM)', ' (Call first)', ' [FULL] (PM)']
+
+# Routes that are not in the route assignments
+UNMATCHED_ROUTES = ['MYSTERY LANE-9', 'PICKUP HOLD', 'ZZ TEST ROUTE', 'OVERFLOW-3']
+
+DAYS = ['SUN', 'MON', 'TUE', 'WED', 'THU', 'FRI']
+
+
+def label_routes():
+    """(day, route name) pairs taken from the built-in route assignments"""
+    return [tuple(key.split('_', 1)) for key in DEFAULT_ROUTE_ASSIGNMENTS]
+
+
+def random_route(rng, routes, unmatched_ratio):
+    """A "DAY | Route" line with Client Track style decorations"""
+    if rng.random() < unmatched_ratio:
+        day, route = rng.choice(DAYS), rng.choice(UNMATCHED_ROUTES)
+    else:
+        day, route = rng.choice(routes)
+    return f"{day} | {route}{rng.choice(DECORATIONS)}"
+
+
+def generate_label_rows(labels, layout='mixed', unmatched_ratio=0.05, seed=0):
+    """
+    Yield the rows of a label sheet as tuples of cell values.
+
+    'compact' puts every line of a label in the first of three columns,
+    'wide' spreads labels over twelve mostly empty columns with the route
+    in the third, 'mixed' varies the route column, the number of address
+    lines and the spacing between labels, and 'sparse' varies the address
+    lines and spacing like 'mixed' over sixteen mostly empty columns with
+    the route in the third or fourth.
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout {layout!r}; expected one of {', '.join(LAYOUTS)}")
+
+    rng = random.Random(seed)
+    routes = label_routes()
+    width = {'wide': 12, 'sparse': 16}.get(layout, 3)
+
+    def row(*cells):
+        return tuple(cells) + (None,) * (width - len(cells))
+
+    for number in range(labels):
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} #{number}"
+        route_line = random_route(rng, routes, unmatched_ratio)
+
+        yield row("Happy Birthday!")
+        yield row(name)
+
+        if layout == 'compact':
+            yield row(f"{rng.randint(100, 9999)} {rng.choice(STREETS)}")
+            yield row(rng.choice(CITIES))
+            yield row(route_line)
+        elif layout == 'wide':
+            yield row(f"{rng.randint(100, 9999)} {rng.choice(STREETS)}", None, None, f"Apt {rng.randint(1, 40)}")
+            yield row(rng.choice(CITIES), None, None, None, None, rng.randint(90000, 93999))
+            yield row(None, None, route_line)
+        elif layout == 'mixed':
+            for _ in range(rng.randint(1, 3)):
+                yield row(f"{rng.randint(100, 9999)} {rng.choice(STREETS)}")
+            route_row = [None] * width
+            route_row[rng.randrange(width)] = route_line
+            yield tuple(route_row)
+        else:
+            for _ in range(rng.randint(1, 3)):
+                yield row(f"{rng.randint(100, 9999)} {rng.choice(STREETS)}", None, None, None, None, None,
+                          None, None, None, None, None, None, None, rng.randint(90000, 93999))
+            route_row = [None] * width
+            route_row[rng.choice((2, 3))] = route_line
+            yield tuple(route_row)
+
+        # Blank spacer rows between labels
+        for _ in range(1 if layout in ('compact', 'wide') else rng.randint(0, 2)):
+            yield row()
+
+
+def generator_version():
+    """
+    Short hash of this generator's code and the route assignments it draws
+    routes from. Changes whenever the same arguments would generate a
+    different export.
+    """
+    digest = hashlib.sha256()
+    with open(os.path.abspath(__file__), 'rb') as f:
+        digest.update(f.read())
+    digest.update(repr(sorted(DEFAULT_ROUTE_ASSIGNMENTS.items())).encode('utf-8'))
+    return digest.hexdigest()[:12]
+
+
+def write_label_workbook(path, labels, layout='mixed', unmatched_ratio=0.05, seed=0):
+    """
+    Write a label export with the given number of labels to Sheet1 of an
+    .xlsx file and return the number of rows written
+    """
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet('Sheet1')
+    rows = 0
+    for values in generate_label_rows(labels, layout, unmatched_ratio, seed):
+        rows += 1
+        if rows > MAX_SHEET_ROWS:
+            raise ValueError(f"{labels} labels do not fit in one worksheet ({MAX_SHEET_ROWS} rows)")
+        ws.append(values)
+    wb.save(path)
+    return rows
+
+
+def generate_client_table(labels, unmatched_ratio=0.05, seed=0):
+    """
+    The Client/Route table extract_client_data would produce for a sheet
+    with the given number of labels. Used for sizes that do not fit in a
+    worksheet.
+    """
+    import pandas as pd
+
+    rng = random.Random(seed)
+    routes = label_routes()
+    clients = [f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} #{number}" for number in range(labels)]
+    route_lines = [random_route(rng, routes, unmatched_ratio) for _ in range(labels)]
+    return pd.DataFrame({'Client': clients, 'Route': route_lines})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic Happy Birthday label export.")
+    parser.add_argument("--labels", "-n", type=int, default=1000, help="number of labels (default: 1000)")
+    parser.add_argument("--layout", choices=LAYOUTS, default='mixed', help="label layout (default: mixed)")
+    parser.add_argument("--unmatched", type=float, default=0.05, metavar="RATIO",
+                        help="share of labels with routes missing from the assignments (default: 0.05)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed (default: 0)")
+    parser.add_argument("--output", "-o", required=True, help="output .xlsx file")
+    args = parser.parse_args(argv)
+
+    rows = write_label_workbook(args.output, args.labels, args.layout, args.unmatched, args.seed)
+    print(f"Wrote {args.labels} labels ({rows} rows) to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
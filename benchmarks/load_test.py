@@ -0,0 +1,117 @@
+"""
+Load-test the HTTP conversion service started with
+`birthday_bag_exporter.py --serve`.
+
+Sends the same label export from several client threads at once and
+reports throughput, latency percentiles and response codes as JSON,
+optionally followed by the service's own /metrics.
+
+Example:
+    python birthday_bag_exporter.py --serve --jobs 2 &
+    python benchmarks/load_test.py --labels 2000 --requests 40 --concurrency 8
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from birthday_bag_exporter import DEFAULT_SERVICE_PORT  # noqa: E402
+from generate_labels import LAYOUTS, write_label_workbook  # noqa: E402
+
+
+def send_export(url, body, timeout):
+    """POST one export and return (HTTP status, seconds, response bytes)"""
+    request = urllib.request.Request(url, data=body, method='POST',
+                                     headers={'Content-Type': 'application/octet-stream'})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            data = response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        data = e.read()
+        status = e.code
+    except OSError:
+        # Refused or dropped connections and client-side timeouts
+        data = b''
+        status = 0
+    return status, time.perf_counter() - start, len(data)
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, round(fraction * (len(sorted_values) - 1)))
+    return round(sorted_values[index], 4)
+
+
+def run_load(url, body, requests, concurrency, timeout):
+    """Send requests copies of body from concurrency threads and summarize the responses"""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda _: send_export(url, body, timeout), range(requests)))
+    elapsed = time.perf_counter() - start
+
+    statuses = {}
+    for status, _, _ in results:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    latencies = sorted(seconds for status, seconds, _ in results if status == 200)
+    return {
+        'requests': requests,
+        'concurrency': concurrency,
+        'seconds': round(elapsed, 3),
+        'converted_per_sec': round(len(latencies) / elapsed, 3) if elapsed else None,
+        'statuses': statuses,
+        'latency': {
+            'p50': percentile(latencies, 0.5),
+            'p90': percentile(latencies, 0.9),
+            'p99': percentile(latencies, 0.99),
+            'max': round(latencies[-1], 4) if latencies else None,
+        },
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the Birthday Bag Exporter HTTP service.")
+    parser.add_argument("--url", default=f"http://127.0.0.1:{DEFAULT_SERVICE_PORT}/convert",
+                        help="conversion endpoint (default: %(default)s)")
+    parser.add_argument("--file", help="label export to send (default: a generated one)")
+    parser.add_argument("--labels", type=int, default=1000, help="labels in the generated export (default: 1000)")
+    parser.add_argument("--layout", choices=LAYOUTS, default='mixed', help="layout of the generated export")
+    parser.add_argument("--requests", "-n", type=int, default=20, help="number of conversions (default: 20)")
+    parser.add_argument("--concurrency", "-c", type=int, default=4, help="client threads (default: 4)")
+    parser.add_argument("--timeout", type=float, default=300, help="client timeout per request in seconds")
+    parser.add_argument("--metrics", action="store_true", help="print the service's /metrics afterwards")
+    args = parser.parse_args(argv)
+
+    if args.file:
+        with open(args.file, 'rb') as f:
+            body = f.read()
+    else:
+        with tempfile.TemporaryDirectory() as data_dir:
+            path = os.path.join(data_dir, "labels.xlsx")
+            write_label_workbook(path, args.labels, layout=args.layout)
+            with open(path, 'rb') as f:
+                body = f.read()
+
+    report = run_load(args.url, body, args.requests, args.concurrency, args.timeout)
+    report['export_bytes'] = len(body)
+    print(json.dumps(report, indent=2))
+
+    if args.metrics:
+        metrics_url = args.url.rsplit('/', 1)[0] + "/metrics"
+        with urllib.request.urlopen(metrics_url, timeout=args.timeout) as response:
+            print(response.read().decode('utf-8'), end="")
+
+    return 0 if report['statuses'].get('200') == args.requests else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
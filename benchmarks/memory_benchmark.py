@@ -0,0 +1,103 @@
+"""
+Measure the memory the pandas engine's working table takes on large runs.
+
+Starts from the client table extraction produces (generated, so sizes
+beyond one worksheet work), then runs matching, ordering, formatting, the
+day separators and the decoding of every output row the workbook writer
+does, without writing the workbook. Each stage is run under tracemalloc
+and reported with its wall time, its peak traced memory and the size of
+the table it hands on, as JSON.
+
+Example:
+    python benchmarks/memory_benchmark.py --sizes 100000 1000000
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd  # noqa: E402
+
+from birthday_bag_exporter import RouteDataProcessor  # noqa: E402
+from generate_labels import generate_client_table  # noqa: E402
+
+
+def table_mb(table):
+    """Size of a table's arrays, not counting the strings its rows share"""
+    return round(table.memory_usage(index=True).sum() / 2 ** 20, 3)
+
+
+def measure_pipeline(labels, seed):
+    """Run each stage on a generated table and return its measurements"""
+    processor = RouteDataProcessor()
+    table = generate_client_table(labels, seed=seed)
+    stages = [
+        ('extract', processor.compact_client_table),
+        ('match', processor.match_clients_to_vans),
+        ('order', processor.order_by_day_and_van),
+        ('format', processor.format_output),
+        ('separators', processor.add_day_separators),
+    ]
+
+    results = {}
+    tracemalloc.start()
+    try:
+        for name, stage in stages:
+            tracemalloc.reset_peak()
+            start = time.perf_counter()
+            table = stage(table)
+            results[name] = {
+                'seconds': round(time.perf_counter() - start, 4),
+                'peak_mb': round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 3),
+                'table_mb': table_mb(table),
+            }
+
+        tracemalloc.reset_peak()
+        start = time.perf_counter()
+        rows = sum(1 for _ in processor.iter_table_rows(table))
+        results['decode'] = {
+            'seconds': round(time.perf_counter() - start, 4),
+            'peak_mb': round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 3),
+        }
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'labels': labels,
+        'rows': rows,
+        'stages': results,
+        'total_seconds': round(sum(stats['seconds'] for stats in results.values()), 4),
+        'peak_mb': max(stats['peak_mb'] for stats in results.values()),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure the memory of the Birthday Bag Exporter working table.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100000, 1000000], metavar="LABELS",
+                        help="table sizes in labels (default: 100000 1000000)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for the table (default: 0)")
+    parser.add_argument("--output", "-o", help="write the JSON report to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = {
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'runs': [measure_pipeline(labels, args.seed) for labels in args.sizes],
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,201 @@
+"""
+Measure how each stage of the Birthday Bag Exporter pipeline scales.
+
+Generates (or reuses) synthetic label exports of the requested sizes, runs
+each pipeline stage on them and reports wall time, peak traced memory and
+rows per second as JSON, along with whole runs of each processing engine.
+Pass --baseline with an earlier report to flag stages that got slower.
+
+Example:
+    python benchmarks/run_benchmarks.py --sizes 1000 10000 --output bench.json
+    python benchmarks/run_benchmarks.py --sizes 1000 10000 --baseline bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd  # noqa: E402
+
+from birthday_bag_exporter import ENGINES, RouteDataProcessor  # noqa: E402
+from generate_labels import LAYOUTS, generate_client_table, generator_version, write_label_workbook  # noqa: E402
+
+
+def corpus_file(data_dir, labels, layout, seed):
+    """
+    Path of a generated label export, writing it on first use. Returns None
+    when the labels do not fit in one worksheet. Exports from an earlier
+    version of the generator are not reused.
+    """
+    path = os.path.join(data_dir, f"labels_{labels}_{layout}_{seed}_{generator_version()}.xlsx")
+    if not os.path.exists(path):
+        try:
+            write_label_workbook(path, labels, layout=layout, seed=seed)
+        except ValueError:
+            return None
+    return path
+
+
+def measure(stage, make_input, repeat):
+    """
+    Run stage(make_input()) repeat times for the best wall time, then once
+    more under tracemalloc for the peak memory. Returns the stage result and
+    its measurements.
+    """
+    best = None
+    for _ in range(repeat):
+        stage_input = make_input()
+        start = time.perf_counter()
+        result = stage(stage_input)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+        del stage_input
+
+    stage_input = make_input()
+    tracemalloc.start()
+    try:
+        result = stage(stage_input)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return result, {'seconds': round(best, 6), 'peak_mb': round(peak / 2 ** 20, 3)}
+
+
+def benchmark_size(labels, layout, data_dir, repeat, seed, engines=ENGINES):
+    """Measure every stage, and a whole run of each engine, for one corpus size"""
+    results = {}
+    engine_results = {}
+
+    # Each stage gets a fresh processor so memoized lookups start cold
+    fresh = RouteDataProcessor
+
+    report_file = corpus_file(data_dir, labels, layout, seed)
+    if report_file is not None:
+        client_data, results['extract'] = measure(
+            lambda path: fresh().extract_client_data(path), lambda: report_file, repeat)
+    else:
+        # Too many labels for one worksheet, so start from the table
+        # extraction would have produced
+        client_data = generate_client_table(labels, seed=seed)
+
+    matched, results['match'] = measure(
+        lambda data: fresh().match_clients_to_vans(data), client_data.copy, repeat)
+    ordered, results['order'] = measure(
+        lambda data: fresh().order_by_day_and_van(data), matched.copy, repeat)
+    formatted, results['format'] = measure(
+        lambda data: fresh().format_output(data), ordered.copy, repeat)
+    final_data, results['separators'] = measure(
+        lambda data: fresh().add_day_separators(data), formatted.copy, repeat)
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        output_file = os.path.join(out_dir, "routes.xlsx")
+        _, results['write'] = measure(
+            lambda data: fresh().write_excel_output(data, output_file), lambda: final_data, repeat)
+
+        # Whole runs from the export to the workbook, to compare the engines
+        if report_file is not None:
+            for engine in engines:
+                _, engine_results[engine] = measure(
+                    lambda path: RouteDataProcessor(engine=engine).process_route_data(path, output_file),
+                    lambda: report_file, repeat)
+
+    for stats in list(results.values()) + list(engine_results.values()):
+        stats['rows_per_sec'] = round(labels / stats['seconds']) if stats['seconds'] else None
+
+    return {
+        'labels': labels,
+        'layout': layout,
+        'rows': int(len(final_data)),
+        'stages': results,
+        'engines': engine_results,
+        'total_seconds': round(sum(stats['seconds'] for stats in results.values()), 6),
+    }
+
+
+def run_timings(run):
+    """Measurements of a run's stages and engine runs by name"""
+    timings = dict(run['stages'])
+    timings.update((f"{engine} run", stats) for engine, stats in run.get('engines', {}).items())
+    return timings
+
+
+def compare(report, baseline, tolerance, min_seconds=0.005):
+    """
+    Print each stage's time relative to the baseline and return the stages
+    that got slower by more than the tolerance. Differences below
+    min_seconds are treated as noise.
+    """
+    if baseline.get('generator') != report['generator']:
+        print("Warning: the baseline was measured on exports from another version of generate_labels.py",
+              file=sys.stderr)
+    previous = {(run['labels'], run['layout']): run for run in baseline.get('runs', [])}
+    regressions = []
+    for run in report['runs']:
+        before = previous.get((run['labels'], run['layout']))
+        if before is None:
+            continue
+        old_timings = run_timings(before)
+        for stage, stats in run_timings(run).items():
+            old = old_timings.get(stage)
+            if not old or not old['seconds']:
+                continue
+            ratio = stats['seconds'] / old['seconds']
+            flag = ""
+            if ratio > tolerance and stats['seconds'] - old['seconds'] > min_seconds:
+                flag = "  <-- slower"
+                regressions.append((run['labels'], stage, ratio))
+            print(f"{run['labels']:>9} {stage:<12} {old['seconds']:>10.4f}s -> {stats['seconds']:>10.4f}s  x{ratio:.2f}{flag}",
+                  file=sys.stderr)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Birthday Bag Exporter pipeline stages.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000], metavar="LABELS",
+                        help="corpus sizes in labels (default: 1000 10000 100000)")
+    parser.add_argument("--layout", choices=LAYOUTS, default='mixed', help="label layout (default: mixed)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per stage, best is kept (default: 3)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for the corpus (default: 0)")
+    parser.add_argument("--engines", choices=ENGINES, nargs="+", default=list(ENGINES),
+                        help="engines to time on whole runs (default: all)")
+    parser.add_argument("--data-dir", default=os.path.join(tempfile.gettempdir(), "birthday_bag_benchmarks"),
+                        help="where generated label exports are kept between runs")
+    parser.add_argument("--output", "-o", help="write the JSON report to this file instead of stdout")
+    parser.add_argument("--baseline", help="earlier JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=1.25,
+                        help="slowdown ratio against the baseline that counts as a regression (default: 1.25)")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    report = {
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'generator': generator_version(),
+        'runs': [benchmark_size(labels, args.layout, args.data_dir, args.repeat, args.seed, args.engines)
+                 for labels in args.sizes],
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""
+Measure how long the Birthday Bag Exporter takes to start.
+
+Imports the module in a fresh interpreter with -X importtime to show which
+imports startup pays for, then launches the GUI in fresh interpreters and
+reports the time from launch until the window is drawn (first paint) and
+until the processing libraries are loaded. Exits with status 1 when first
+paint takes longer than the target.
+
+Example:
+    python benchmarks/startup_benchmark.py --target 1.0
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Run in the child: draw the window, then load what the first run needs
+GUI_STARTUP_SCRIPT = """
+import time
+import birthday_bag_exporter
+root, app = birthday_bag_exporter.create_gui()
+root.update()
+print(time.time())
+birthday_bag_exporter.prewarm_imports()
+print(time.time())
+root.destroy()
+"""
+
+
+def import_times(top=10):
+    """
+    Import the module under -X importtime and return its total import time
+    and the slowest imports it pulled in, in seconds
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import birthday_bag_exporter"],
+        cwd=REPO_DIR, capture_output=True, text=True, check=True
+    )
+    imports = []
+    for line in result.stderr.splitlines():
+        # "import time: <self us> | <cumulative us> | <indented module name>"
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        imports.append((name.strip(), int(cumulative) / 1e6))
+
+    total = next(seconds for name, seconds in imports if name == "birthday_bag_exporter")
+    slowest = sorted((item for item in imports if item[0] != "birthday_bag_exporter"),
+                     key=lambda item: item[1], reverse=True)[:top]
+    return total, slowest
+
+
+def gui_startup_time():
+    """
+    Seconds from launching a fresh interpreter until the window is drawn
+    and until the processing libraries are loaded
+    """
+    launched = time.time()
+    result = subprocess.run([sys.executable, "-c", GUI_STARTUP_SCRIPT], cwd=REPO_DIR,
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "GUI did not start")
+    painted, ready = (float(value) for value in result.stdout.split()[-2:])
+    return painted - launched, ready - launched
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Birthday Bag Exporter startup.")
+    parser.add_argument("--repeat", type=int, default=5, help="GUI launches, best is kept (default: 5)")
+    parser.add_argument("--target", type=float, default=1.0,
+                        help="longest acceptable time to first paint in seconds (default: 1.0)")
+    parser.add_argument("--output", "-o", help="write the JSON report to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    total, slowest = import_times()
+    report = {
+        'python': sys.version.split()[0],
+        'module_import_seconds': round(total, 4),
+        'slowest_imports': [{'module': name, 'seconds': round(seconds, 4)} for name, seconds in slowest],
+        'target_first_paint_seconds': args.target,
+    }
+
+    try:
+        runs = [gui_startup_time() for _ in range(args.repeat)]
+    except RuntimeError as e:
+        # No display, for example on a build server
+        print(f"GUI startup not measured: {e}", file=sys.stderr)
+        runs = []
+    if runs:
+        report['first_paint_seconds'] = round(min(painted for painted, _ in runs), 4)
+        report['ready_seconds'] = round(min(ready for _, ready in runs), 4)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if runs and report['first_paint_seconds'] > args.target:
+        print(f"First paint took {report['first_paint_seconds']:.2f}s, over the {args.target:.2f}s target",
+              file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
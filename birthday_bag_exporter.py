@@ -1,13 +1,27 @@
-import pandas as pd
+# pandas, numpy and openpyxl take seconds to import on slow machines, so
+# they are imported by the functions that use them and pre-loaded in the
+# background once the GUI window is up (see prewarm_imports). tkinter and
+# tkinterdnd2 are only imported when the GUI starts (see import_gui_modules),
+# so the command line runs on servers without Tk.
 import re
 import os
 import sys
-import tkinter as tk
-from tkinter import filedialog, messagebox, ttk
 import subprocess
 import threading
-from openpyxl import load_workbook
-from openpyxl.styles import Border, Side, PatternFill, Font, Alignment
+import queue
+import multiprocessing
+import argparse
+import glob
+import json
+import time
+import hashlib
+import pickle
+import sqlite3
+from bisect import bisect_right
+from contextlib import closing, contextmanager
+from concurrent.futures import CancelledError, ProcessPoolExecutor, as_completed
+from collections import deque
+from itertools import islice
 
 # Helper to load resources when bundled with PyInstaller
 def resource_path(relative_path: str) -> str:
@@ -18,39 +32,1856 @@ def resource_path(relative_path: str) -> str:
         base_path = os.path.abspath(".")
     return os.path.join(base_path, relative_path)
 
+# Order of the days in the output
+DAY_ORDER = ['SUN', 'MON', 'TUE', 'WED', 'THU', 'FRI', 'SAT']
+
+# Integer sort key for vans that are neither numbers nor VOL-#/VOLUNTEER-#
+LAST_VAN_SORT_VALUE = 2 ** 62
+
 # Precompiled regular expressions for reuse
 ROUTE_PATTERN = re.compile(r"(MON|TUE|WED|THU|FRI|SAT|SUN)\s+\|\s+(.*?)$")
 DAY_PATTERN = re.compile(r"(MON|TUE|WED|THU|FRI|SAT|SUN)")
+PARENTHESES_PATTERN = re.compile(r'\s*\(.*?\)')
+FULL_TAG_PATTERN = re.compile(r'\[FULL\]\s*')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+ROUTE_BASE_PATTERN = re.compile(r'([A-Za-z\s]+)')
+# Words of a route name, as looked up in the word aliases
+ROUTE_WORD_PATTERN = re.compile(r'[^\s-]+')
+
+# Columns of the output sheet; the Day column is hidden and only identifies
+# the separator rows between days
+OUTPUT_COLUMNS = ['VAN #', 'Client', 'Route Name & Day', 'Notes', 'Day']
+
+# Processing engines: "pandas" builds a table per stage, "records" streams
+# ClientRecord objects through generator stages without any DataFrame
+ENGINES = ('pandas', 'records')
+
+# Default name of the formatted route workbook
+DEFAULT_OUTPUT_NAME = "Birthday_Bag_Routes.xlsx"
+
+# Size limit of the parsed input cache before least recently used entries go
+DEFAULT_CACHE_BYTES = 256 * 2 ** 20
+
+# How often the GUI applies progress posted by the processing thread (~30 Hz)
+PROGRESS_POLL_MS = 33
+
+# Files the GUI processes at once, each in its own worker process
+GUI_MAX_WORKERS = max(1, min(4, os.cpu_count() or 1))
+
+# Route editor tab holding the word aliases, after the day tabs
+ALIASES_TAB = "Aliases"
+
+# Rows processed between checks for cancellation
+CANCEL_CHECK_ROWS = 500
+
+# Rows of the final table decoded to Python values at a time for writing
+DECODE_CHUNK_ROWS = 10000
+
+# A label block spans the "Happy Birthday!" row, the client name row and up to
+# five more rows that may hold the route line
+LABEL_WINDOW_ROWS = 7
+
+# Label starts looked at before trusting a regular layout (see LabelLayout)
+LAYOUT_SAMPLE_LABELS = 16
+
+# Watch mode: a new export is processed once its size and modification time
+# have not changed for WATCH_SETTLE_SECONDS, and the folder is rescanned every
+# WATCH_POLL_SECONDS where inotify cannot report new files as they arrive
+WATCH_SETTLE_SECONDS = 2.0
+WATCH_POLL_SECONDS = 5.0
+WATCH_EXTENSIONS = ('.xlsx', '.xlsm', '.xls')
+
+# Sibling folder that receives the workbooks of a watched folder, and the
+# ledger of processed exports kept in it
+WATCH_OUTPUT_FOLDER = "processed"
+WATCH_LEDGER_NAME = ".birthday_bag_ledger.json"
+
+# Port of the HTTP conversion service (see conversion_service.py), and how
+# long it lets a request upload or convert before giving up
+DEFAULT_SERVICE_PORT = 8765
+DEFAULT_SERVICE_TIMEOUT = 120.0
+
+# Route assignments dictionary - easily editable
+DEFAULT_ROUTE_ASSIGNMENTS = {
+    # SUN routes
+    'SUN_CANYON COUNTRY-2': '8',
+    'SUN_NORTHEAST-2': '2',
+    'SUN_NORTHEAST-3': '3',
+    'SUN_SOUTH GATE-5': '4',
+    'SUN_WESTMONT PARK-1': '5',
+    'SUN_WESTSIDE-1': '6',
+    'SUN_EAST LA-4': '7',
+    'SUN_CANYON CNTRY-2': '8',
+    'SUN_ROSEGATE-1': '9',
+    'SUN_CULVER CITY': '10',
+    'SUN_VERDUGO': '11',
+            
+    # MON routes
+    'MON_CANYON CNTRY-1': '1',
+    'MON_EAST LA-1': '2',
+    'MON_EAST LA-2': '3',
+    'MON_EAST LA-3': '4',
+    'MON_MID CITY-1': '5',
+    'MON_MID CITY-2': '6',
+    'MON_MID CITY-3': '7',
+    'MON_ROSECRANS-1': '8',
+    'MON_SOUTH GATE-1': '9',
+    'MON_SAN GABRIEL-2': '10',
+    'MON_ROSECRANS-2': '11',
+    'MON_MID CITY-4': 'VOL-1',
+    'MON_CANYON CNTRY-3': 'VOL-2',
+            
+    # TUE routes
+    'TUE_NO. HOLLYWOOD-2': '1',
+    'TUE_NORTH VALLEY-1': '2',
+    'TUE_NORTH VALLEY-2': '3',
+    'TUE_SILVERLAKE-1': '4',
+    'TUE_SOUTH GATE-2': '5',
+    'TUE_SOUTH GATE-3': '6',
+    'TUE_VERNON-1': '7',
+    'TUE_WAC-1': '8',
+    'TUE_WAC-4': '9',
+    'TUE_VERNON-2': '10',
+    'TUE_SOUTH LA-1': '11',
+    'TUE_NOHO-1': 'VOLUNTEER-1',
+    'TUE_BRAD': 'VOLUNTEER-2',
+    'TUE_THE ELITE': 'VOLUNTEER-3',
+    'TUE_PICK UP LIST': 'VOLUNTEER-4',
+            
+    # WED routes
+    'WED_SOUTH BAY-4': '1',
+    'WED_LAUREL-2': '2',
+    'WED_LONG BEACH-1': '3',
+    'WED_SAN GABRIEL-1': '4',
+    'WED_SEPULVEDA-2': '5',
+    'WED_SILVERLAKE-3': '6',
+    'WED_SOUTH BAY-1': '7',
+    'WED_SOUTHEAST-2': '8',
+    'WED_WAC-2': '9',
+    'WED_WRHAP-1': '10',
+    'WED_SOUTHEAST-4': '11',
+    'WED_LAUREL-1': 'VOLUNTEER-1',
+    'WED_COA NEIGHBORHOOD': 'VOLUNTEER-2',
+            
+    # THU routes
+    'THU_AGAPE-1': '1',
+    'THU_DOWNTOWN-1': '2',
+    'THU_HOLLYWOOD-1': '3',
+    'THU_LA PUENTE-1': '4',
+    'THU_LANCASTER-1': '5',
+    'THU_LANCASTER-2': '6',
+    'THU_SEPULVEDA-1': '7',
+    'THU_SOUTH BAY-2': '8',
+    'THU_SOUTHEAST-1': '9',
+    'THU_WESTSIDE-2': '10',
+    'THU_SOUTH BAY PLUS': '11',
+    'THU_HOLLYWOOD-2': 'VOLUNTEER-1',
+    'THU_PALM PLUS': 'VOLUNTEER-2',
+            
+    # FRI routes
+    'FRI_HOLLYWOOD-3': '1',
+    'FRI_HUNTINGTON PARK-1': '2',
+    'FRI_NORTHEAST-1': '3',
+    'FRI_SOUTH BAY-3': '4',
+    'FRI_SOUTH GATE-4': '5',
+    'FRI_WAC-3': '6',
+    'FRI_WEST VALLEY-1': '7',
+    'FRI_WEST VALLEY-2': '8',
+    'FRI_WEST VALLEY-3': '9',
+    'FRI_SOUTHEAST-3': '10',
+    'FRI_HUNTINGTON PARK-2': '11',
+}
+
+# Alternate spellings of words in route names -> the words they stand for.
+# Route names on both sides are read through these before they are compared,
+# so "CANYON CNTRY-2" and "CANYON COUNTRY-2" are the same route.
+DEFAULT_WORD_ALIASES = {
+    'CNTRY': 'COUNTRY',
+    'NO.': 'NORTH',
+    'NOHO': 'NORTH HOLLYWOOD',
+}
+
+
+def apply_word_aliases(route_name, word_aliases):
+    """Route name with each word that has an alias replaced by what it stands for"""
+    if not word_aliases:
+        return route_name
+    return ROUTE_WORD_PATTERN.sub(lambda match: word_aliases.get(match.group(), match.group()), route_name)
+
+
+class RouteIndex:
+    """
+    Precomputed lookups over the route assignments, grouped by day.
+    Answers find_van_for_route without scanning every assignment while
+    keeping its priority order: exact key, then base route name, then
+    partial match, with earlier assignments winning ties. Route names are
+    compared after the word aliases are applied, as clean_route_name does.
+    """
+
+    def __init__(self, route_assignments, extract_route_base, route_aliases=None, word_aliases=None):
+        self.route_assignments = route_assignments
+        self.extract_route_base = extract_route_base
+        # "DAY_ALIAS" -> the route name it stands for on that day
+        self.route_aliases = route_aliases if route_aliases is not None else {}
+        # Alternate spelling -> the words it stands for
+        self.word_aliases = word_aliases if word_aliases is not None else {}
+        # "DAY_ROUTE" with the word aliases applied -> van number. A key
+        # spelled that way already wins over one that only reads the same.
+        self.canonical_keys = {}
+        # Van numbers per day, in assignment order
+        self.day_vans = {}
+        # The "DAY_ROUTE" keys of each day, as entered and with the word
+        # aliases applied, joined in assignment order so a substring search
+        # finds the earliest key first
+        self.joined_keys = {}
+        # Where each key starts in the joined keys, and its position
+        self.key_starts = {}
+        self.key_positions = {}
+        # Route names (the part after "DAY_"), both ways -> earliest position
+        self.route_positions = {}
+        # Distinct route name lengths, for sliding over a base name
+        self.route_lengths = {}
+        # Van numbers already resolved for full "DAY | Route" strings
+        self.resolved_routes = {}
+
+        spelled_alike = {}
+        for key, van in route_assignments.items():
+            if '_' not in key:
+                continue
+            day, route = key.split('_', 1)
+            canonical_route = self.canonical(route)
+            if canonical_route == route:
+                self.canonical_keys.setdefault(key, van)
+            else:
+                spelled_alike.setdefault(f"{day}_{canonical_route}", van)
+            vans = self.day_vans.setdefault(day, [])
+            position = len(vans)
+            vans.append(van)
+
+            # Partial matches work on the spelling entered as well as the
+            # rewritten one, so aliases only ever add matches
+            joined = self.joined_keys.setdefault(day, [])
+            starts = self.key_starts.setdefault(day, [])
+            key_positions = self.key_positions.setdefault(day, [])
+            positions = self.route_positions.setdefault(day, {})
+            lengths = self.route_lengths.setdefault(day, set())
+            for name in dict.fromkeys((route, canonical_route)):
+                starts.append(starts[-1] + len(joined[-1]) + 1 if joined else 0)
+                joined.append(f"{day}_{name}")
+                key_positions.append(position)
+                positions.setdefault(name, position)
+                lengths.add(len(name))
+
+        for key, van in spelled_alike.items():
+            self.canonical_keys.setdefault(key, van)
+        for day, joined in self.joined_keys.items():
+            self.joined_keys[day] = "\n".join(joined)
+
+        # "DAY_ALIAS" with the word aliases applied -> van number of its route
+        self.alias_vans = {}
+        for key, route in self.route_aliases.items():
+            day, alias = key.split('_', 1)
+            van = self.canonical_keys.get(f"{day}_{self.canonical(route)}")
+            if van is not None:
+                self.alias_vans.setdefault(f"{day}_{self.canonical(alias)}", van)
+
+    def canonical(self, route_name):
+        """Route name with the word aliases applied"""
+        return apply_word_aliases(route_name, self.word_aliases)
+
+    def find_van(self, day, route_name, entered_name=None):
+        """
+        Find the van number for a given day and cleaned route name.
+        entered_name is the same name before the word aliases were applied.
+        """
+        # Try exact match first, on the name as entered
+        if entered_name is not None:
+            van = self.route_assignments.get(f"{day}_{entered_name}")
+            if van is not None:
+                return van
+
+        # Then on the name with the word aliases applied
+        key = f"{day}_{route_name}"
+        van = self.canonical_keys.get(key)
+        if van is not None:
+            return van
+
+        # Then an exact match through an alias
+        van = self.alias_vans.get(key)
+        if van is not None:
+            return van
+
+        vans = self.day_vans.get(day)
+        if not vans:
+            return ""
+
+        # Try to match the base route name anywhere in a key
+        base_route = self.extract_route_base(route_name)
+        position = self.first_key_containing(day, base_route)
+        if position is None:
+            # Try partial matching. The base route is not inside any route
+            # name at this point, so only route names inside it can match.
+            position = self.first_route_within(day, base_route)
+
+        return vans[position] if position is not None else ""
+
+    def first_key_containing(self, day, text):
+        """
+        Position of the earliest "DAY_ROUTE" key for the day that contains text
+        """
+        joined = self.joined_keys[day]
+        starts = self.key_starts[day]
+        offset = joined.find(text)
+        while offset != -1:
+            key = bisect_right(starts, offset) - 1
+            key_end = starts[key + 1] - 1 if key + 1 < len(starts) else len(joined)
+            if offset + len(text) <= key_end:
+                return self.key_positions[day][key]
+            # The match runs across the end of a key
+            offset = joined.find(text, offset + 1)
+        return None
+
+    def first_route_within(self, day, text):
+        """
+        Position of the earliest route name for the day that occurs in text
+        """
+        positions = self.route_positions[day]
+        best = None
+        for length in self.route_lengths[day]:
+            for start in range(len(text) - length + 1):
+                position = positions.get(text[start:start + length])
+                if position is not None and (best is None or position < best):
+                    best = position
+        return best
+
+
+def peak_rss_bytes():
+    """Peak resident set size of this process in bytes, or None if unknown"""
+    try:
+        import resource
+    except ImportError:
+        resource = None
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS reports bytes, Linux kilobytes
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+    if sys.platform == 'win32':
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [
+                ("cb", wintypes.DWORD),
+                ("PageFaultCount", wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t),
+                ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t),
+                ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        get_current_process = ctypes.windll.kernel32.GetCurrentProcess
+        get_current_process.restype = wintypes.HANDLE
+        get_memory_info = ctypes.windll.psapi.GetProcessMemoryInfo
+        get_memory_info.argtypes = [wintypes.HANDLE, ctypes.c_void_p, wintypes.DWORD]
+        if get_memory_info(get_current_process(), ctypes.byref(counters), counters.cb):
+            return counters.PeakWorkingSetSize
+    return None
+
+
+class StageSpan:
+    """Measurements for one pipeline stage"""
+
+    def __init__(self, name, start):
+        self.name = name
+        # Seconds since the tracer was created
+        self.start = start
+        self.wall = 0.0
+        self.cpu = 0.0
+        # Rows the stage produced, when it produces a table
+        self.rows = None
+        self.peak_rss = None
+        self.thread_id = threading.get_ident()
+
+
+class StageTracer:
+    """
+    Records wall time, CPU time, row counts and peak RSS for each stage of
+    a pipeline run, for the status area or a Chrome trace-event file
+    """
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.spans = []
+
+    @contextmanager
+    def span(self, name):
+        """Time the enclosed block as a stage; set .rows on the span to record its size"""
+        span = StageSpan(name, time.perf_counter() - self.origin)
+        cpu_start = time.process_time()
+        try:
+            yield span
+        finally:
+            span.wall = time.perf_counter() - self.origin - span.start
+            span.cpu = time.process_time() - cpu_start
+            span.peak_rss = peak_rss_bytes()
+            self.spans.append(span)
+
+    def summary(self):
+        """Per-stage breakdown such as "extract 1.20s, match 0.01s, ..." """
+        return ", ".join(f"{span.name} {span.wall:.2f}s" for span in self.spans)
+
+    def chrome_trace_events(self):
+        """The spans as Chrome trace-event "complete" events"""
+        pid = os.getpid()
+        events = []
+        for span in self.spans:
+            args = {'cpu_ms': round(span.cpu * 1000, 3)}
+            if span.rows is not None:
+                args['rows'] = span.rows
+            if span.peak_rss is not None:
+                args['peak_rss_mb'] = round(span.peak_rss / 2 ** 20, 1)
+            events.append({
+                'name': span.name,
+                'cat': 'pipeline',
+                'ph': 'X',
+                'ts': round(span.start * 1e6),
+                'dur': round(span.wall * 1e6),
+                'pid': pid,
+                'tid': span.thread_id,
+                'args': args,
+            })
+        return events
+
+    def write_chrome_trace(self, trace_file):
+        """Write the spans as a trace file for chrome://tracing or Perfetto"""
+        with open(trace_file, 'w') as f:
+            json.dump({'traceEvents': self.chrome_trace_events(), 'displayTimeUnit': 'ms'}, f, indent=1)
+
+
+def app_data_dir():
+    """
+    Per-user directory for the exporter's cache and settings. Set
+    BIRTHDAY_BAG_HOME to use a different location.
+    """
+    override = os.environ.get('BIRTHDAY_BAG_HOME')
+    if override:
+        return override
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+        return os.path.join(base, 'BirthdayBagExporter')
+    if sys.platform == 'darwin':
+        return os.path.expanduser('~/Library/Application Support/BirthdayBagExporter')
+    base = os.environ.get('XDG_DATA_HOME') or os.path.expanduser('~/.local/share')
+    return os.path.join(base, 'birthday_bag_exporter')
+
+
+def file_content_hash(path, chunk_size=2 ** 20):
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ParsedInputCache:
+    """
+    On-disk cache of the Client/Route tables extracted from label exports,
+    keyed by the export's path, size, modification time and content hash.
+    Least recently used entries are evicted once the cache is larger than
+    max_bytes.
+    """
+
+    # Bump when extraction changes so tables parsed by older code are not reused
+    FORMAT_VERSION = 2
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_CACHE_BYTES):
+        self.cache_dir = cache_dir or os.path.join(app_data_dir(), 'cache')
+        self.max_bytes = max_bytes
+
+    def key_for(self, report_file):
+        """Cache key of a label export"""
+        stat = os.stat(report_file)
+        parts = [
+            str(self.FORMAT_VERSION),
+            os.path.abspath(report_file),
+            str(stat.st_size),
+            str(stat.st_mtime_ns),
+            file_content_hash(report_file),
+        ]
+        return hashlib.sha256('\0'.join(parts).encode('utf-8')).hexdigest()
+
+    def entry_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def get(self, key):
+        """The cached table for key, or None"""
+        path = self.entry_path(key)
+        try:
+            with open(path, 'rb') as f:
+                client_data = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Unreadable entries, e.g. from another pandas version, are dropped
+            self.remove(path)
+            return None
+        # The modification time doubles as the last-used time for eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return client_data
+
+    def put(self, key, client_data):
+        """Store a table and evict old entries if the cache is over its limit"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self.entry_path(key)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'wb') as f:
+            pickle.dump(client_data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+        self.evict()
+
+    def entries(self):
+        """(last used, size, path) of every cache entry"""
+        entries = []
+        try:
+            names = os.listdir(self.cache_dir)
+        except FileNotFoundError:
+            return entries
+        for name in names:
+            if not name.endswith('.pkl'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits in max_bytes"""
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            self.remove(path)
+            total -= size
+
+    def clear(self):
+        """Remove every entry and return how many there were"""
+        entries = self.entries()
+        for _, _, path in entries:
+            self.remove(path)
+        return len(entries)
+
+    @staticmethod
+    def remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def assignments_by_day(route_assignments):
+    """The (route, van) pairs of each day, in assignment order"""
+    days = {}
+    for key, van in route_assignments.items():
+        if '_' in key:
+            day, route = key.split('_', 1)
+            days.setdefault(day, []).append((route, van))
+    return days
+
+
+def category_codes(values):
+    """
+    (codes, categories) of a Series, read straight from it when it is
+    already categorical. Missing values get code -1, as with pd.factorize.
+    """
+    import pandas as pd
+    
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy(), values.cat.categories
+    return pd.factorize(values)
+
+
+def changed_route_days(old_assignments, new_assignments):
+    """
+    Days whose routes, van numbers or route order differ. A route's van
+    depends only on the assignments for its own day.
+    """
+    old_days = assignments_by_day(old_assignments)
+    new_days = assignments_by_day(new_assignments)
+    return {day for day in old_days.keys() | new_days.keys() if old_days.get(day) != new_days.get(day)}
+
+
+class RouteStore:
+    """
+    Route assignments, route aliases and word aliases kept in a SQLite
+    database, so edits made in the route editor survive restarts. A new
+    database starts with DEFAULT_ROUTE_ASSIGNMENTS and DEFAULT_WORD_ALIASES.
+    Every save bumps a version counter.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS meta (
+            name TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS routes (
+            day TEXT NOT NULL,
+            route TEXT NOT NULL,
+            normalized_route TEXT NOT NULL,
+            van TEXT NOT NULL,
+            -- Order within the day; earlier routes win partial matches
+            position INTEGER NOT NULL,
+            PRIMARY KEY (day, route)
+        );
+        CREATE INDEX IF NOT EXISTS routes_by_normalized_route ON routes (day, normalized_route);
+        CREATE TABLE IF NOT EXISTS route_aliases (
+            day TEXT NOT NULL,
+            alias TEXT NOT NULL,
+            route TEXT NOT NULL,
+            PRIMARY KEY (day, alias)
+        );
+        CREATE TABLE IF NOT EXISTS word_aliases (
+            alias TEXT PRIMARY KEY,
+            words TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(app_data_dir(), 'routes.sqlite3')
+
+    def connect(self):
+        """Open the database, creating and seeding it on first use"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        db = sqlite3.connect(self.path)
+        try:
+            with db:
+                # Databases made before word aliases existed get the defaults too
+                had_word_aliases = db.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'word_aliases'"
+                ).fetchone() is not None
+                db.executescript(self.SCHEMA)
+                if self.read_version(db) == 0:
+                    self.write_assignments(db, DEFAULT_ROUTE_ASSIGNMENTS)
+                    self.bump_version(db)
+                if not had_word_aliases:
+                    self.write_word_aliases(db, DEFAULT_WORD_ALIASES)
+        except Exception:
+            db.close()
+            raise
+        return db
+
+    @staticmethod
+    def normalize(route):
+        """Route name as compared in lookups: upper case, single spaces"""
+        return WHITESPACE_PATTERN.sub(' ', route).strip().upper()
+
+    @staticmethod
+    def read_version(db):
+        row = db.execute("SELECT value FROM meta WHERE name = 'version'").fetchone()
+        return row[0] if row else 0
+
+    @classmethod
+    def bump_version(cls, db):
+        version = cls.read_version(db) + 1
+        db.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('version', ?)", (version,))
+        return version
+
+    def load(self):
+        """
+        Return the route assignments as a {"DAY_ROUTE": van} dict in day and
+        position order, the aliases as a {"DAY_ALIAS": route} dict and the
+        word aliases as an {alias: words} dict
+        """
+        day_ranks = {day: rank for rank, day in enumerate(DAY_ORDER)}
+        with closing(self.connect()) as db:
+            rows = db.execute("SELECT day, route, van, position FROM routes").fetchall()
+            aliases = db.execute("SELECT day, alias, route FROM route_aliases ORDER BY day, alias").fetchall()
+            word_aliases = dict(db.execute("SELECT alias, words FROM word_aliases ORDER BY alias"))
+        rows.sort(key=lambda row: (day_ranks.get(row[0], len(DAY_ORDER)), row[0], row[3]))
+        route_assignments = {f"{day}_{route}": van for day, route, van, _ in rows}
+        route_aliases = {f"{day}_{alias}": route for day, alias, route in aliases}
+        return route_assignments, route_aliases, word_aliases
+
+    def save(self, route_assignments, word_aliases=None):
+        """
+        Write the assignments, and the word aliases if given, back in one
+        transaction, touching only the rows that were added, removed or
+        changed, and return the new version
+        """
+        with closing(self.connect()) as db:
+            with db:
+                self.write_assignments(db, route_assignments)
+                if word_aliases is not None:
+                    self.write_word_aliases(db, word_aliases)
+                return self.bump_version(db)
+
+    def write_assignments(self, db, route_assignments):
+        wanted = {}
+        for day, routes in assignments_by_day(route_assignments).items():
+            for position, (route, van) in enumerate(routes):
+                wanted[(day, route)] = (van, position)
+
+        current = {(day, route): (van, position)
+                   for day, route, van, position in db.execute("SELECT day, route, van, position FROM routes")}
+        db.executemany("DELETE FROM routes WHERE day = ? AND route = ?", current.keys() - wanted.keys())
+        db.executemany(
+            "INSERT OR REPLACE INTO routes (day, route, normalized_route, van, position) VALUES (?, ?, ?, ?, ?)",
+            [(day, route, self.normalize(route), van, position)
+             for (day, route), (van, position) in wanted.items() if current.get((day, route)) != (van, position)]
+        )
+
+    def write_word_aliases(self, db, word_aliases):
+        wanted = {self.normalize(alias): self.normalize(words) for alias, words in word_aliases.items()}
+        current = dict(db.execute("SELECT alias, words FROM word_aliases"))
+        db.executemany("DELETE FROM word_aliases WHERE alias = ?", [(alias,) for alias in current.keys() - wanted.keys()])
+        db.executemany("INSERT OR REPLACE INTO word_aliases (alias, words) VALUES (?, ?)",
+                       [(alias, words) for alias, words in wanted.items() if current.get(alias) != words])
+
+    def save_alias(self, day, alias, route):
+        """Make alias a second name for route on the given day and return the new version"""
+        with closing(self.connect()) as db:
+            with db:
+                db.execute("INSERT OR REPLACE INTO route_aliases (day, alias, route) VALUES (?, ?, ?)",
+                           (day, self.normalize(alias), route))
+                return self.bump_version(db)
+
+    def remove_alias(self, day, alias):
+        """Remove an alias and return the new version, or None if there was no such alias"""
+        with closing(self.connect()) as db:
+            with db:
+                removed = db.execute("DELETE FROM route_aliases WHERE day = ? AND alias = ?",
+                                     (day, self.normalize(alias))).rowcount
+                return self.bump_version(db) if removed else None
+
+
+class LabelLayout:
+    """
+    The grid a label export is laid out on, learned while its first labels
+    stream past: a label starts every `stride` rows and its route line sits
+    at the same row and column offset from the "Happy Birthday!" row.
+    Once a label breaks the pattern, the layout is given up for good.
+    """
+
+    def __init__(self, sample_size=LAYOUT_SAMPLE_LABELS):
+        self.sample_size = sample_size
+        self.starts = []
+        self.route_cells = set()
+        # Set once the sample agrees on a layout
+        self.stride = None
+        self.route_cell = None
+        self.next_start = None
+        self.irregular = False
+
+    def observe(self, start, route_cell):
+        """
+        Record a label found by the full scan: the row it starts on and the
+        (row offset, column) of its route line, or None if it had none
+        """
+        if self.stride is not None or self.irregular:
+            return
+        self.starts.append(start)
+        if route_cell is not None:
+            self.route_cells.add(route_cell)
+        if len(self.starts) < self.sample_size:
+            return
+
+        strides = {later - earlier for earlier, later in zip(self.starts, self.starts[1:])}
+        if len(strides) == 1 and len(self.route_cells) == 1:
+            self.stride = strides.pop()
+            self.route_cell = self.route_cells.pop()
+            self.next_start = start + self.stride
+        else:
+            self.irregular = True
+
+    def expect(self, start):
+        """
+        Whether a label starting on this row fits the layout; moves on to the
+        next expected start if it does and gives the layout up if not
+        """
+        if start != self.next_start:
+            self.abandon()
+            return False
+        self.next_start += self.stride
+        return True
+
+    def abandon(self):
+        self.stride = None
+        self.route_cell = None
+        self.next_start = None
+        self.irregular = True
+
+
+class ProcessingCancelled(Exception):
+    """Raised inside the pipeline when its run has been cancelled"""
+
+
+class ClientRecord:
+    """One label on its way through the records engine"""
+
+    __slots__ = ('client', 'route', 'van', 'day')
+
+    def __init__(self, client, route):
+        self.client = client
+        # Full "DAY | Route" line from the label
+        self.route = route
+        self.van = ""
+        # Position of the route's day in DAY_ORDER, len(DAY_ORDER) if it has none
+        self.day = len(DAY_ORDER)
+
+
+class RunState:
+    """
+    The extracted and matched clients of a run, kept so that route edits
+    can be applied without reading the export again
+    """
+
+    def __init__(self, report_file, output_file, client_data, route_codes, unique_routes, route_vans, route_assignments,
+                 word_aliases):
+        self.report_file = report_file
+        self.output_file = output_file
+        # Client and Route columns as extracted
+        self.client_data = client_data
+        # Position of each client's route in unique_routes (-1 if missing)
+        self.route_codes = route_codes
+        self.unique_routes = unique_routes
+        # Van number of each unique route, plus a trailing "" for code -1
+        self.route_vans = route_vans
+        # Snapshot of the assignments and word aliases the vans were matched against
+        self.route_assignments = route_assignments
+        self.word_aliases = word_aliases
+
+
+class RouteDataProcessor:
+    """
+    The route sheet pipeline, from a Client Track label export to the
+    formatted workbook. It never touches Tk, so it can run on the GUI's
+    worker thread, from the command line or in a process pool.
+    """
+
+    def __init__(self, route_assignments=None, progress_callback=None, input_cache=None, engine='pandas',
+                 route_aliases=None, cancel_event=None, word_aliases=None):
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine {engine!r}; expected one of {', '.join(ENGINES)}")
+        if route_assignments is None:
+            route_assignments = dict(DEFAULT_ROUTE_ASSIGNMENTS)
+        self.route_assignments = route_assignments
+        # "DAY_ALIAS" -> route name, as loaded from a RouteStore
+        self.route_aliases = route_aliases if route_aliases is not None else {}
+        # Alternate spelling -> the words it stands for, applied by clean_route_name
+        if word_aliases is None:
+            word_aliases = dict(DEFAULT_WORD_ALIASES)
+        self.word_aliases = word_aliases
+        # Optional ParsedInputCache that lets re-runs skip Excel parsing
+        self.input_cache = input_cache
+        # Built on first lookup and whenever the assignments or aliases are replaced
+        self._route_index = None
+        # Called with (percent, message) as the pipeline reaches each stage
+        self.progress_callback = progress_callback
+        # Stage timings of the most recent run
+        self.last_trace = None
+        # Matching results of the last match_clients_to_vans call
+        self.route_matches = None
+        # State of the last process_route_data run, for reapply_route_assignments
+        self.last_run = None
+        # Which pipeline process_route_data runs, one of ENGINES
+        self.engine = engine
+        # threading.Event or Manager().Event() that stops the run at the
+        # next check once set
+        self.cancel_event = cancel_event
+
+    def sort_key(self, van):
+        """Helper function to sort van numbers correctly"""
+        if van.isdigit():
+            return int(van)
+        elif van.startswith('VOLUNTEER-') and van[10:].isdigit():
+            return 100 + int(van[10:])  # Put VOLUNTEER-# after numeric vans
+        elif van.startswith('VOL-') and van[4:].isdigit():
+            return 100 + int(van[4:])  # Put VOL-# after numeric vans
+        else:
+            # For other non-numeric values, put them at the end
+            return float('inf')
+    
+    def check_cancelled(self):
+        """Raise ProcessingCancelled if the run has been cancelled"""
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise ProcessingCancelled("Processing was cancelled")
+    
+    def checked(self, rows):
+        """Yield rows, checking for cancellation every CANCEL_CHECK_ROWS rows"""
+        for number, row in enumerate(rows):
+            if number % CANCEL_CHECK_ROWS == 0:
+                self.check_cancelled()
+            yield row
+    
+    def iter_report_rows(self, report_file):
+        """
+        Yield the rows of Sheet1 as tuples of cell values, streaming them
+        from the workbook instead of loading the whole sheet into memory
+        """
+        from openpyxl import load_workbook
+        
+        wb = load_workbook(report_file, read_only=True, data_only=True, keep_links=False)
+        try:
+            if 'Sheet1' not in wb.sheetnames:
+                raise ValueError("Worksheet named 'Sheet1' not found")
+            ws = wb['Sheet1']
+            # Exports do not always record their dimensions correctly
+            ws.reset_dimensions()
+            yield from ws.iter_rows(values_only=True)
+        finally:
+            wb.close()
+
+    def scan_label_window(self, window):
+        """
+        Return the (client, route) pair for a label starting at the first row
+        of the window, or None if there is no label with a route there
+        """
+        label = self.locate_label(window)
+        return label[:2] if label else None
+    
+    def locate_label(self, window):
+        """
+        Like scan_label_window, but also return where the route line was
+        found, as (client, route, (row offset, column))
+        """
+        first_row = window[0]
+        if not (first_row and isinstance(first_row[0], str) and "Happy Birthday!" in first_row[0]):
+            return None
+        if len(window) < 2:
+            return None
+
+        # Next row should contain client name
+        client_name = window[1][0] if window[1] else None
+
+        # Look for route information in nearby rows (up to 5 rows after client name)
+        for row_offset, row in enumerate(islice(window, 2, LABEL_WINDOW_ROWS), 2):
+            # Skip blank rows without looking at each of their cells
+            if row.count(None) == len(row):
+                continue
+            for column, value in enumerate(row):
+                # Every route line has a "|" between the day and the route
+                if isinstance(value, str) and '|' in value:
+                    match = ROUTE_PATTERN.search(value)
+                    if match:
+                        return client_name, f"{match.group(1)} | {match.group(2)}", (row_offset, column)
+        return None
+
+    def read_layout_label(self, window, route_cell):
+        """
+        The (client, route) pair of a label on a known layout, reading only
+        the name cell and the cell the route line should be in. Falls back to
+        the full scan when that cell does not hold a route line, or when a
+        cell left of it in the same row, which the layout keeps blank, is not.
+        Address lines above the route line are not read, so a "|" in one of
+        them does not take the place of the route line as it would in the
+        full scan.
+        """
+        row_offset, column = route_cell
+        row = window[row_offset]
+        if row and column < len(row) and row[:column].count(None) == column:
+            value = row[column]
+            if isinstance(value, str):
+                match = ROUTE_PATTERN.search(value)
+                if match:
+                    client_name = window[1][0] if window[1] else None
+                    return client_name, f"{match.group(1)} | {match.group(2)}"
+        return self.scan_label_window(window)
+
+    def iter_labels(self, rows):
+        """
+        Yield (client, route) pairs while rows stream past, keeping only a
+        rolling window of one label block in memory. Once the first labels
+        show a regular layout, only the first cell of each row and the
+        route cell of each label are looked at.
+        """
+        window = deque(maxlen=LABEL_WINDOW_ROWS)
+        layout = LabelLayout()
+        start = -LABEL_WINDOW_ROWS
+        for row in rows:
+            window.append(row)
+            start += 1
+            if start < 0:
+                continue
+            
+            first_row = window[0]
+            if not (first_row and isinstance(first_row[0], str) and "Happy Birthday!" in first_row[0]):
+                if start == layout.next_start:
+                    # An expected label is missing
+                    layout.abandon()
+                continue
+            
+            if layout.stride is not None and layout.expect(start):
+                label = self.read_layout_label(window, layout.route_cell)
+            else:
+                located = self.locate_label(window)
+                layout.observe(start, located[2] if located else None)
+                label = located[:2] if located else None
+            if label:
+                yield label
+
+        # Scan the labels that start in the last rows of the sheet
+        if len(window) == LABEL_WINDOW_ROWS:
+            window.popleft()
+        while window:
+            label = self.scan_label_window(window)
+            if label:
+                yield label
+            window.popleft()
+
+    def extract_client_data(self, report_file):
+        """
+        Extract client data from Sheet1 of the Report file
+        This function will extract client names and their routes
+        """
+        import pandas as pd
+        
+        self.update_progress(10, "Extracting client data...")
+        
+        cache_key = None
+        if self.input_cache is not None:
+            cache_key = self.input_cache.key_for(report_file)
+            client_data = self.input_cache.get(cache_key)
+            if client_data is not None:
+                return client_data
+        
+        if report_file.lower().endswith(('.xlsx', '.xlsm')):
+            labels = list(self.iter_labels(self.checked(self.iter_report_rows(report_file))))
+            
+            # Create a dataframe with the extracted data
+            client_data = pd.DataFrame(labels, columns=['Client', 'Route'])
+        else:
+            # openpyxl cannot stream legacy .xls files, so load them with pandas
+            df = pd.read_excel(report_file, sheet_name='Sheet1', header=None)
+            self.check_cancelled()
+            client_data = self.extract_labels_from_frame(df)
+        client_data = self.compact_client_table(client_data)
+        
+        if cache_key is not None:
+            try:
+                self.input_cache.put(cache_key, client_data)
+            except OSError:
+                # A cache that cannot be written only costs speed
+                pass
+        
+        return client_data
+    
+    def extract_labels_from_frame(self, df):
+        """
+        Extract client names and routes from a sheet already loaded into a
+        DataFrame, using whole-column operations instead of per-cell access
+        """
+        import numpy as np
+        import pandas as pd
+        
+        # Columns without any text (empty, numbers, dates) cannot hold a label
+        # or a route line, so only the others are searched
+        text_columns = [column for column, dtype in enumerate(df.dtypes) if dtype.kind not in 'biufcmM']
+        n_rows, n_cols = len(df), len(text_columns)
+        if n_rows == 0 or n_cols == 0 or text_columns[0] != 0:
+            return pd.DataFrame(columns=['Client', 'Route'])
+        
+        # Flatten the text columns row by row so a cell's position is row * n_cols + col
+        cells = pd.Series(df.iloc[:, text_columns].to_numpy(dtype=object).ravel())
+        strings = cells[cells.map(lambda value: isinstance(value, str))]
+        positions = strings.index.to_numpy()
+        
+        # Rows whose first column contains "Happy Birthday!" and have a client row after them
+        first_col = strings[positions % n_cols == 0]
+        is_label = first_col.str.contains("Happy Birthday!", regex=False).to_numpy(dtype=bool)
+        label_rows = first_col.index.to_numpy()[is_label] // n_cols
+        label_rows = label_rows[label_rows + 1 < n_rows]
+        
+        # Every route line in the sheet, in reading order. Only strings with
+        # the "|" between day and route are worth matching.
+        route_parts = strings[strings.str.contains('|', regex=False)].str.extract(ROUTE_PATTERN)
+        route_parts = route_parts[route_parts[0].notna()]
+        route_positions = route_parts.index.to_numpy()
+        
+        # The first route line within the 5 rows after each client name
+        window_start = (label_rows + 2) * n_cols
+        window_end = np.minimum(label_rows + LABEL_WINDOW_ROWS, n_rows) * n_cols
+        first_route = np.searchsorted(route_positions, window_start)
+        found = first_route < len(route_positions)
+        found[found] = route_positions[first_route[found]] < window_end[found]
+        label_rows = label_rows[found]
+        first_route = first_route[found]
+        
+        clients = df.iloc[label_rows + 1, 0].to_numpy()
+        routes = (route_parts[0].iloc[first_route] + " | " + route_parts[1].iloc[first_route]).to_numpy()
+        
+        return pd.DataFrame({
+            'Client': clients,
+            'Route': routes
+        })
+    
+    def compact_client_table(self, client_data):
+        """
+        Store the Route column of an extracted table as a categorical, in
+        place: an export has thousands of labels but only about a hundred
+        distinct routes, so every later stage works on small integer codes
+        and only the writer turns them back into strings
+        """
+        import pandas as pd
+        
+        if not isinstance(client_data['Route'].dtype, pd.CategoricalDtype):
+            client_data['Route'] = pd.Categorical(client_data['Route'])
+        return client_data
+    
+    def match_clients_to_vans(self, client_data):
+        """
+        Match clients to van numbers based on their routes
+        """
+        import numpy as np
+        
+        self.update_progress(30, "Matching clients to vans...")
+        
+        # Resolve each distinct route once, then broadcast the van numbers
+        # back to the clients. A missing route (code -1) picks the trailing "".
+        client_data = self.compact_client_table(client_data)
+        codes, unique_routes = category_codes(client_data['Route'])
+        van_numbers = np.array([self.resolve_route(route) for route in self.checked(unique_routes)] + [""], dtype=object)
+        
+        # Add van numbers to client data
+        client_data['VAN #'] = self.van_column(van_numbers, codes)
+        self.route_matches = (codes, unique_routes, van_numbers)
+        
+        return client_data
+    
+    @staticmethod
+    def van_column(route_vans, route_codes):
+        """
+        The VAN # column as a categorical, from the van of each distinct
+        route (with a trailing "" for code -1) and each client's route code
+        """
+        import pandas as pd
+        
+        van_codes, vans = pd.factorize(route_vans)
+        return pd.Categorical.from_codes(van_codes.take(route_codes), categories=vans)
+    
+    def resolve_route(self, route):
+        """
+        Find the van number for a full "DAY | Route" string. Results are
+        remembered until the route assignments change.
+        """
+        resolved_routes = self.route_index.resolved_routes
+        if route not in resolved_routes:
+            van_num = ""
+            # Extract day and route name
+            match = ROUTE_PATTERN.match(route)
+            if match:
+                day = match.group(1)
+                route_name = match.group(2).strip()
+                
+                # Clean route name for matching, as entered and with the
+                # word aliases applied
+                entered_route = self.clean_route_name(route_name, apply_aliases=False)
+                cleaned_route = apply_word_aliases(entered_route, self.word_aliases)
+                
+                # Try to find a match in route assignments
+                van_num = self.find_van_for_route(day, cleaned_route, entered_route) or ""
+            resolved_routes[route] = van_num
+        return resolved_routes[route]
+    
+    def clean_route_name(self, route_name, apply_aliases=True):
+        """
+        Clean and standardize route names for better matching
+        """
+        # Remove any text in parentheses
+        cleaned = PARENTHESES_PATTERN.sub('', route_name)
+        # Remove [FULL] tag
+        cleaned = FULL_TAG_PATTERN.sub('', cleaned)
+        # Remove extra spaces
+        cleaned = WHITESPACE_PATTERN.sub(' ', cleaned).strip()
+        # Convert to uppercase for case-insensitive comparison, then spell
+        # every word the way the route assignments are looked up
+        cleaned = cleaned.upper()
+        return apply_word_aliases(cleaned, self.word_aliases) if apply_aliases else cleaned
+    
+    @property
+    def route_index(self):
+        """Lookup structure for the current route assignments"""
+        index = self._route_index
+        if (index is None or index.route_assignments is not self.route_assignments
+                or index.route_aliases is not self.route_aliases or index.word_aliases is not self.word_aliases):
+            self._route_index = RouteIndex(self.route_assignments, self.extract_route_base, self.route_aliases,
+                                           self.word_aliases)
+        return self._route_index
+    
+    def find_van_for_route(self, day, route_name, entered_name=None):
+        """
+        Find the van number for a given day and route name
+        """
+        return self.route_index.find_van(day, route_name, entered_name)
+    
+    def extract_route_base(self, route_name):
+        """
+        Extract the base part of the route name (e.g., "SOUTH BAY" from "SOUTH BAY-1")
+        """
+        # Extract the part before any dash or number
+        match = ROUTE_BASE_PATTERN.match(route_name)
+        if match:
+            return match.group(1).strip()
+        return route_name
+    
+    def order_by_day_and_van(self, client_data):
+        """
+        Order the client data by day of week and then by van number
+        """
+        import numpy as np
+        import pandas as pd
+        
+        self.update_progress(50, "Ordering by day and van...")
+        
+        # Day of each distinct route as an ordered categorical; routes
+        # without a day sort last
+        route_codes, unique_routes = category_codes(client_data['Route'])
+        route_days = pd.Series(unique_routes, dtype=object).str.extract(f"^{DAY_PATTERN.pattern}", expand=False)
+        day_type = pd.CategoricalDtype(DAY_ORDER + [""], ordered=True)
+        route_day_codes = pd.Categorical(route_days.fillna(""), dtype=day_type).codes
+        day_codes = np.append(route_day_codes, day_type.categories.get_loc("")).take(route_codes)
+        
+        # Van sort key of each distinct van, following sort_key
+        van_codes, unique_vans = category_codes(client_data['VAN #'])
+        van_keys = np.array(
+            [self.van_sort_value(van) for van in unique_vans] + [LAST_VAN_SORT_VALUE], dtype=np.int64
+        ).take(van_codes)
+        
+        # One stable sort by day and then by van number
+        order = np.lexsort((van_keys, day_codes))
+        client_data = client_data.take(order)
+        client_data['Day'] = pd.Categorical.from_codes(day_codes[order], dtype=day_type)
+        
+        return client_data
+    
+    def van_sort_value(self, van):
+        """sort_key as an integer, with LAST_VAN_SORT_VALUE for vans that sort last"""
+        key = self.sort_key(van) if isinstance(van, str) else float('inf')
+        return LAST_VAN_SORT_VALUE if key == float('inf') else key
+    
+    def format_output(self, client_data):
+        """
+        Format the output to match Sheet2 format
+        """
+        import numpy as np
+        import pandas as pd
+        
+        self.update_progress(60, "Formatting output...")
+        
+        # Assemble the output columns from the existing ones instead of
+        # reordering, renaming and inserting into copies of the table. The
+        # empty Notes column is a categorical with a single "" category.
+        notes = pd.Categorical.from_codes(np.zeros(len(client_data), dtype=np.int8), categories=[""])
+        return pd.DataFrame({
+            'VAN #': client_data['VAN #'],
+            'Client': client_data['Client'],
+            'Route Name & Day': client_data['Route'],
+            'Notes': pd.Series(notes, index=client_data.index),
+            'Day': client_data['Day'],
+        }, columns=OUTPUT_COLUMNS, copy=False)
+    
+    def add_day_separators(self, formatted_data):
+        """
+        Add empty rows between different days to match the Sheet2 format
+        """
+        import numpy as np
+        import pandas as pd
+        
+        self.update_progress(70, "Adding day separators...")
+        
+        # The rows are already ordered by day, so a separator goes wherever
+        # the day changes
+        day_codes, days = category_codes(formatted_data['Day'])
+        boundaries = np.flatnonzero(day_codes[1:] != day_codes[:-1]) + 1
+        
+        # Positions of the input rows in the output, with -1 for separators
+        positions = np.insert(np.arange(len(day_codes)), boundaries, -1)
+        separators = positions == -1
+        
+        # Build each column in one take, blanking the separator rows.
+        # Categorical columns stay categorical, with "" added if needed.
+        result = {}
+        for column in formatted_data.columns:
+            if column == 'Day':
+                continue
+            values = formatted_data[column]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                codes, categories = category_codes(values)
+                categories = list(categories)
+                if '' not in categories:
+                    categories.append('')
+                codes = codes.take(positions).astype(np.int32)
+                codes[separators] = categories.index('')
+                result[column] = pd.Categorical.from_codes(codes, categories=categories)
+            else:
+                result[column] = pd.api.extensions.take(values.array, positions, allow_fill=True, fill_value='')
+        
+        # Mark each separator with the day it closes, as the category after
+        # the days' own ones
+        separator_codes = len(days) + day_codes[boundaries - 1]
+        day_codes = day_codes.take(positions)
+        day_codes[separators] = separator_codes
+        result['Day'] = pd.Categorical.from_codes(
+            day_codes, categories=list(days) + [f"SEPARATOR_{day}" for day in days]
+        )
+        
+        return pd.DataFrame(result, columns=formatted_data.columns)
+    
+    def write_excel_output(self, final_data, output_file):
+        """
+        Write the formatted Excel file in a single pass, with black bars for
+        the top of the sheet and the separator rows between days
+        """
+        return self.write_sheet_rows(self.iter_table_rows(final_data), output_file)
+    
+    def iter_table_rows(self, final_data):
+        """
+        Yield the OUTPUT_COLUMNS values of each row as a tuple, turning
+        categorical codes back into strings DECODE_CHUNK_ROWS rows at a time.
+        Missing values come out as None, so the writer needs no pandas.
+        """
+        import numpy as np
+        
+        columns = [final_data[column] for column in OUTPUT_COLUMNS]
+        for start in range(0, len(final_data), DECODE_CHUNK_ROWS):
+            chunk = []
+            for column in columns:
+                part = column.iloc[start:start + DECODE_CHUNK_ROWS]
+                values = part.tolist()
+                if part.hasnans:
+                    for position in np.flatnonzero(part.isna().to_numpy()):
+                        values[position] = None
+                chunk.append(values)
+            yield from zip(*chunk)
+    
+    def write_sheet_rows(self, rows, output_file):
+        """
+        Write rows of OUTPUT_COLUMNS values to the formatted workbook as they
+        arrive and return how many were written
+        """
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+        
+        self.update_progress(80, "Writing formatted workbook...")
+        
+        # Rows are streamed to disk as they are appended, so memory use does
+        # not grow with the number of rows
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet('Sheet1')
+        
+        # Define styles
+        thin_border = Border(
+            left=Side(style='thin'),
+            right=Side(style='thin'),
+            top=Side(style='thin'),
+            bottom=Side(style='thin')
+        )
+        
+        black_fill = PatternFill(start_color="000000", end_color="000000", fill_type="solid")
+        
+        # Set column widths to match the screenshot; column dimensions must
+        # be set before any rows are written
+        ws.column_dimensions['A'].width = 10  # VAN #
+        ws.column_dimensions['B'].width = 30  # Client
+        ws.column_dimensions['C'].width = 40  # Route Name & Day
+        ws.column_dimensions['D'].width = 15  # Notes
+        
+        # Hide the Day column (E)
+        ws.column_dimensions['E'].hidden = True
+        
+        # Black bar at the top, merged across A to D
+        black_bar = WriteOnlyCell(ws)
+        black_bar.fill = black_fill
+        ws.append([black_bar])
+        ws.merged_cells.add("A1:D1")
+        
+        # Header row
+        header = []
+        for name in OUTPUT_COLUMNS[:4]:
+            cell = WriteOnlyCell(ws, value=name)
+            cell.border = thin_border
+            cell.font = Font(bold=True)
+            cell.alignment = Alignment(horizontal='center')
+            header.append(cell)
+        ws.append(header + [OUTPUT_COLUMNS[4]])
+        
+        # Each appended row is written out before the next one is built, so
+        # the same styled cells can be reused for every data row
+        bordered_cells = [WriteOnlyCell(ws) for _ in range(4)]
+        for cell in bordered_cells:
+            cell.border = thin_border
+        
+        row_number = 2
+        try:
+            for values in self.checked(rows):
+                row_number += 1
+                day = values[4]
+                
+                if isinstance(day, str) and day.startswith("SEPARATOR_"):
+                    # Separator rows are a single black bar merged across A to D
+                    ws.append([black_bar, None, None, None, day])
+                    ws.merged_cells.add(f"A{row_number}:D{row_number}")
+                    continue
+                
+                for cell, value in zip(bordered_cells, values):
+                    cell.value = value
+                ws.append(bordered_cells + [day])
+        except BaseException:
+            # Close the sheet's temporary file before giving up on the workbook
+            ws.close()
+            raise
+        
+        # Save the workbook next to the output first, so a failed or
+        # cancelled run never leaves a half-written workbook behind
+        self.check_cancelled()
+        partial_file = os.path.join(os.path.dirname(output_file), f".{os.path.basename(output_file)}.partial")
+        try:
+            wb.save(partial_file)
+            os.replace(partial_file, output_file)
+        except BaseException:
+            if os.path.exists(partial_file):
+                os.remove(partial_file)
+            raise
+        self.update_progress(90, "Finalizing...")
+        return row_number - 2
+    
+    def update_progress(self, value, message=None):
+        """Report progress and status message to the callback, if any"""
+        if self.progress_callback is not None:
+            self.progress_callback(value, message)
+
+    def process_route_data(self, report_file, output_file, trace_file=None):
+        """
+        Main function to process route data. Stage timings are kept in
+        self.last_trace and, if trace_file is given, written there as a
+        Chrome trace-event file.
+        """
+        if self.engine == 'records':
+            return self.process_route_records(report_file, output_file, trace_file)
+        
+        tracer = StageTracer()
+        self.last_trace = tracer
+        self.update_progress(0, "Starting...")
+        
+        with tracer.span("extract") as span:
+            client_data = self.extract_client_data(report_file)
+            span.rows = len(client_data)
+        self.check_cancelled()
+        with tracer.span("match") as span:
+            client_data = self.match_clients_to_vans(client_data)
+            span.rows = len(client_data)
+        
+        self.last_run = RunState(
+            report_file, output_file, client_data[['Client', 'Route']], *self.route_matches,
+            dict(self.route_assignments), dict(self.word_aliases)
+        )
+        
+        return self.write_route_sheet(client_data, output_file, tracer, trace_file)
+    
+    def reapply_route_assignments(self, trace_file=None):
+        """
+        Regenerate the output of the last run after the route assignments
+        changed. Only routes on days whose assignments changed are matched
+        again; the export is not read again.
+        """
+        state = self.last_run
+        if state is None:
+            raise ValueError("No file has been processed yet")
+        # The GUI may save again while this runs; the run state records only
+        # what was compared here, so a later reapply picks up the rest
+        route_assignments = dict(self.route_assignments)
+        word_aliases = dict(self.word_aliases)
+        
+        tracer = StageTracer()
+        self.last_trace = tracer
+        self.update_progress(0, "Applying route changes...")
+        
+        with tracer.span("rematch") as span:
+            changed_days = changed_route_days(state.route_assignments, route_assignments)
+            # New word aliases can change how a route on any day reads
+            aliases_changed = state.word_aliases != word_aliases
+            route_vans = state.route_vans.copy()
+            for code, route in enumerate(state.unique_routes):
+                match = ROUTE_PATTERN.match(route)
+                if match and (aliases_changed or match.group(1) in changed_days):
+                    route_vans[code] = self.resolve_route(route)
+            
+            client_data = state.client_data.copy(deep=False)
+            client_data['VAN #'] = self.van_column(route_vans, state.route_codes)
+            span.rows = len(client_data)
+        
+        state.route_vans = route_vans
+        state.route_assignments = route_assignments
+        state.word_aliases = word_aliases
+        
+        return self.write_route_sheet(client_data, state.output_file, tracer, trace_file)
+    
+    def write_route_sheet(self, client_data, output_file, tracer, trace_file=None):
+        """
+        Order the matched clients, add the day separators and write the
+        formatted workbook
+        """
+        self.check_cancelled()
+        with tracer.span("order") as span:
+            client_data = self.order_by_day_and_van(client_data)
+            span.rows = len(client_data)
+        self.check_cancelled()
+        with tracer.span("format") as span:
+            formatted_data = self.format_output(client_data)
+            span.rows = len(formatted_data)
+        self.check_cancelled()
+        with tracer.span("separators") as span:
+            final_data = self.add_day_separators(formatted_data)
+            span.rows = len(final_data)
+        self.check_cancelled()
+        self.update_progress(75, f"Saving to {output_file}...")
+        with tracer.span("write") as span:
+            self.write_excel_output(final_data, output_file)
+            span.rows = len(final_data)
+
+        if trace_file:
+            tracer.write_chrome_trace(trace_file)
+
+        self.update_progress(100, f"Done! Output saved to {output_file}")
+        return final_data
+    
+    def iter_client_records(self, report_file):
+        """
+        Yield a ClientRecord for each label in the export. .xlsx files are
+        streamed from the workbook; legacy .xls files are loaded whole first.
+        The parsed input cache holds tables, so it is not used.
+        """
+        self.update_progress(10, "Extracting client data...")
+        if report_file.lower().endswith(('.xlsx', '.xlsm')):
+            labels = self.iter_labels(self.checked(self.iter_report_rows(report_file)))
+        else:
+            import pandas as pd
+            df = pd.read_excel(report_file, sheet_name='Sheet1', header=None)
+            self.check_cancelled()
+            labels = self.extract_labels_from_frame(df).itertuples(index=False, name=None)
+        for client, route in labels:
+            yield ClientRecord(client, route)
+    
+    def normalize_records(self, records):
+        """Set the day position of each record from its route line"""
+        day_positions = {day: position for position, day in enumerate(DAY_ORDER)}
+        for record in records:
+            match = DAY_PATTERN.match(record.route)
+            if match:
+                record.day = day_positions[match.group(1)]
+            yield record
+    
+    def match_records(self, records):
+        """Set the van number of each record from its route"""
+        self.update_progress(30, "Matching clients to vans...")
+        for record in self.checked(records):
+            record.van = self.resolve_route(record.route)
+            yield record
+    
+    def bucket_records(self, records):
+        """
+        Consume the records into one bucket per day position, each a dict of
+        van sort key to records in label order
+        """
+        buckets = [{} for _ in range(len(DAY_ORDER) + 1)]
+        van_keys = {}
+        for record in records:
+            van_key = van_keys.get(record.van)
+            if van_key is None:
+                van_key = van_keys[record.van] = self.van_sort_value(record.van)
+            buckets[record.day].setdefault(van_key, []).append(record)
+        return buckets
+    
+    def order_buckets(self, buckets):
+        """
+        The (day, records) pairs of the days that have records, in DAY_ORDER
+        with records without a day last, each ordered by van number
+        """
+        self.update_progress(50, "Ordering by day and van...")
+        days = []
+        for position, vans in enumerate(buckets):
+            if vans:
+                day = DAY_ORDER[position] if position < len(DAY_ORDER) else ""
+                days.append((day, [record for van_key in sorted(vans) for record in vans[van_key]]))
+        return days
+    
+    def iter_output_rows(self, days):
+        """Yield the OUTPUT_COLUMNS rows of the ordered days with a separator between days"""
+        for number, (day, records) in enumerate(days):
+            if number:
+                yield ('', '', '', '', f"SEPARATOR_{days[number - 1][0]}")
+            for record in records:
+                yield (record.van, record.client, record.route, '', day)
+    
+    def process_route_records(self, report_file, output_file, trace_file=None):
+        """
+        process_route_data for the records engine. Extraction, day lookup and
+        matching run as one stream into the day buckets and are timed as a
+        single "stream" stage. Returns the number of rows written.
+        """
+        tracer = StageTracer()
+        self.last_trace = tracer
+        # Route edits can only be reapplied to runs that kept their tables
+        self.last_run = None
+        self.update_progress(0, "Starting...")
+        
+        with tracer.span("stream") as span:
+            records = self.match_records(self.normalize_records(self.iter_client_records(report_file)))
+            buckets = self.bucket_records(records)
+            span.rows = sum(len(group) for vans in buckets for group in vans.values())
+        self.check_cancelled()
+        with tracer.span("order") as span:
+            days = self.order_buckets(buckets)
+            span.rows = sum(len(records) for _, records in days)
+        self.check_cancelled()
+        self.update_progress(75, f"Saving to {output_file}...")
+        with tracer.span("write") as span:
+            rows = self.write_sheet_rows(self.iter_output_rows(days), output_file)
+            span.rows = rows
+        
+        if trace_file:
+            tracer.write_chrome_trace(trace_file)
+        
+        self.update_progress(100, f"Done! Output saved to {output_file}")
+        return rows
+
+
+def process_route_file(report_file, output_file, route_assignments=None, trace_file=None, use_cache=False, engine='pandas',
+                       route_aliases=None, word_aliases=None):
+    """
+    Convert one label export into a formatted route workbook without any
+    GUI. Defined at module level so it can be sent to a process pool.
+    Returns the stage timings of the run.
+    """
+    input_cache = ParsedInputCache() if use_cache else None
+    processor = RouteDataProcessor(route_assignments, input_cache=input_cache, engine=engine, route_aliases=route_aliases,
+                                   word_aliases=word_aliases)
+    processor.process_route_data(report_file, output_file, trace_file)
+    return processor.last_trace
+
+
+def process_route_job(job_id, report_file, output_file, route_assignments, route_aliases, word_aliases, trace_file,
+                      events, cancel_event=None):
+    """
+    Run one of the GUI's jobs in a worker process, posting
+    ("job", job_id, percent, message) progress events to the events queue
+    and stopping with ProcessingCancelled once cancel_event is set.
+    Returns the stage timings and the run state, so that route edits can
+    be reapplied to the output afterwards.
+    """
+    processor = RouteDataProcessor(
+        route_assignments, input_cache=ParsedInputCache(), route_aliases=route_aliases, word_aliases=word_aliases,
+        cancel_event=cancel_event, progress_callback=lambda value, message=None: events.put(("job", job_id, value, message))
+    )
+    processor.process_route_data(report_file, output_file, trace_file)
+    return processor.last_trace, processor.last_run
+
+
+def trace_path_for(output_file):
+    """Chrome trace file written next to an output workbook"""
+    return f"{os.path.splitext(output_file)[0]}.trace.json"
+
 
 # Check and install required packages
 def install_requirements():
+    """
+    Install the packages in requirements.txt if tkinterdnd2 is missing and
+    return whether anything was installed. Blocks while pip runs.
+    """
+    import importlib.util
+    
+    # Check if tkinterdnd2 is installed
+    if importlib.util.find_spec("tkinterdnd2") is not None:
+        return False
+    
+    print("Installing required packages...")
+    subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"])
+    print("Packages installed successfully!")
+    return True
+
+
+def prewarm_imports():
+    """Import the libraries the pipeline needs, so the first run does not wait for them"""
+    import numpy  # noqa: F401
+    import pandas  # noqa: F401
+    import openpyxl  # noqa: F401
+
+# Set by import_gui_modules when the GUI starts
+tk = filedialog = messagebox = ttk = None
+TkinterDnD = DND_FILES = None
+
+
+def import_gui_modules():
+    """Import tkinter and, when it is installed, tkinterdnd2 for the GUI"""
+    global tk, filedialog, messagebox, ttk, TkinterDnD, DND_FILES
+    import tkinter as tk
+    from tkinter import filedialog, messagebox, ttk
     try:
-        # Check if tkinterdnd2 is installed
-        import importlib.util
-        tkdnd_spec = importlib.util.find_spec("tkinterdnd2")
-        
-        if tkdnd_spec is None:
-            print("Installing required packages...")
-            subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"])
-            print("Packages installed successfully!")
-            messagebox.showinfo("Setup Complete", "Required packages have been installed. Please restart the application.")
-            sys.exit(0)
-    except Exception as e:
-        print(f"Error installing packages: {str(e)}")
-        messagebox.showerror("Installation Error", f"Error installing required packages: {str(e)}\n\nPlease run 'pip install -r requirements.txt' manually.")
-
-# Try to import tkinterdnd2
-try:
-    from tkinterdnd2 import DND_FILES, TkinterDnD
-except ImportError:
-    # If not available, attempt to install requirements and fall back
-    root = tk.Tk()
-    root.withdraw()  # Hide the root window
-    install_requirements()
-    root.destroy()
-    # Continue with basic tkinter without drag and drop
-    TkinterDnD = tk.Tk
-    DND_FILES = None
+        from tkinterdnd2 import DND_FILES, TkinterDnD
+    except ImportError:
+        # finish_startup offers to install it
+        TkinterDnD = None
+        DND_FILES = None
+
+
+class RouteTable:
+    """
+    One day's routes in the route editor: a Treeview kept in van order
+    whose van numbers can be edited in place. Only the rows of the tab
+    exist as widgets, however many routes there are.
+    """
+
+    def __init__(self, parent, routes, sort_key):
+        # Route name -> van number, shared with the editor
+        self.routes = routes
+        self.sort_key = sort_key
+        # (entry, route) of the van cell being edited
+        self.editor = None
+        
+        self.tree = ttk.Treeview(parent, columns=('van', 'route'), show='headings', selectmode='browse')
+        self.tree.heading('van', text="Van Number", anchor='w')
+        self.tree.heading('route', text="Route Name", anchor='w')
+        self.tree.column('van', width=110, stretch=False)
+        self.tree.column('route', width=400)
+        scrollbar = ttk.Scrollbar(parent, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        
+        # Sort routes by van number
+        for route, van in sorted(routes.items(), key=lambda item: sort_key(item[1])):
+            self.tree.insert('', 'end', iid=route, values=(van, route))
+        
+        self.tree.bind('<Double-1>', self.begin_edit)
+        self.tree.bind('<Return>', lambda event: self.edit_van(self.tree.focus()))
+    
+    def begin_edit(self, event):
+        """Edit the van number under a double click"""
+        if self.tree.identify_region(event.x, event.y) == 'cell' and self.tree.identify_column(event.x) == '#1':
+            self.edit_van(self.tree.identify_row(event.y))
+    
+    def edit_van(self, route):
+        """Open an entry over the van cell of a route"""
+        self.commit_edit()
+        if not route:
+            return
+        self.tree.see(route)
+        bbox = self.tree.bbox(route, 'van')
+        if not bbox:
+            return
+        x, y, width, height = bbox
+        
+        entry = ttk.Entry(self.tree)
+        entry.insert(0, self.routes[route])
+        entry.select_range(0, tk.END)
+        entry.place(x=x, y=y, width=width, height=height)
+        entry.focus_set()
+        entry.bind('<Return>', lambda event: self.commit_edit())
+        entry.bind('<KP_Enter>', lambda event: self.commit_edit())
+        entry.bind('<Escape>', lambda event: self.cancel_edit())
+        entry.bind('<FocusOut>', lambda event: self.commit_edit())
+        self.editor = (entry, route)
+    
+    def commit_edit(self):
+        """Apply the van number being edited, if any"""
+        if self.editor is None:
+            return
+        entry, route = self.editor
+        van = entry.get().strip()
+        self.cancel_edit()
+        if van != self.routes[route]:
+            self.set_van(route, van)
+    
+    def cancel_edit(self):
+        if self.editor is None:
+            return
+        entry, _ = self.editor
+        self.editor = None
+        entry.destroy()
+        self.tree.focus_set()
+    
+    def set_van(self, route, van):
+        """
+        Set the van number of a route, adding it if it is new, and move its
+        row to its place in van order without touching the other rows
+        """
+        self.routes[route] = van
+        if self.tree.exists(route):
+            self.tree.delete(route)
+        
+        # Rows with the same van number keep their order; the route goes last
+        keys = [self.sort_key(self.routes[other]) for other in self.tree.get_children()]
+        index = bisect_right(keys, self.sort_key(van))
+        self.tree.insert('', index, iid=route, values=(van, route))
+        self.tree.selection_set(route)
+        self.tree.focus(route)
+        self.tree.see(route)
+
+
+class WordAliasTable:
+    """
+    The word aliases in the route editor: a Treeview of each spelling and
+    the words it stands for, in alphabetical order
+    """
+
+    def __init__(self, parent, word_aliases):
+        # Spelling -> words, shared with the editor
+        self.word_aliases = word_aliases
+        
+        self.tree = ttk.Treeview(parent, columns=('alias', 'words'), show='headings', selectmode='browse')
+        self.tree.heading('alias', text="Spelling", anchor='w')
+        self.tree.heading('words', text="Stands For", anchor='w')
+        self.tree.column('alias', width=160, stretch=False)
+        self.tree.column('words', width=350)
+        scrollbar = ttk.Scrollbar(parent, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        
+        for alias in sorted(word_aliases):
+            self.tree.insert('', 'end', iid=alias, values=(alias, word_aliases[alias]))
+    
+    def commit_edit(self):
+        """Nothing is edited in place; aliases change through the form"""
+    
+    def fill_form(self, alias_var, words_var):
+        """Copy the selected alias into the form fields"""
+        alias = self.tree.focus()
+        if alias:
+            alias_var.set(alias)
+            words_var.set(self.word_aliases[alias])
+    
+    def set_alias(self, alias, words):
+        """Add an alias, or change the words of an existing one"""
+        self.word_aliases[alias] = words
+        if self.tree.exists(alias):
+            self.tree.delete(alias)
+        self.tree.insert('', sorted(self.word_aliases).index(alias), iid=alias, values=(alias, words))
+        self.tree.selection_set(alias)
+        self.tree.focus(alias)
+        self.tree.see(alias)
+    
+    def remove_selected(self):
+        for alias in self.tree.selection():
+            del self.word_aliases[alias]
+            self.tree.delete(alias)
+
 
 class BirthdayBagExporter:
     def __init__(self, root):
@@ -77,99 +1908,45 @@ class BirthdayBagExporter:
         self.style.theme_use("clam")
         self.apply_theme()
         
-        # Route assignments dictionary - easily editable
-        self.route_assignments = {
-            # SUN routes
-            'SUN_CANYON COUNTRY-2': '8',
-            'SUN_NORTHEAST-2': '2',
-            'SUN_NORTHEAST-3': '3',
-            'SUN_SOUTH GATE-5': '4',
-            'SUN_WESTMONT PARK-1': '5',
-            'SUN_WESTSIDE-1': '6',
-            'SUN_EAST LA-4': '7',
-            'SUN_CANYON CNTRY-2': '8',
-            'SUN_ROSEGATE-1': '9',
-            'SUN_CULVER CITY': '10',
-            'SUN_VERDUGO': '11',
-            
-            # MON routes
-            'MON_CANYON CNTRY-1': '1',
-            'MON_EAST LA-1': '2',
-            'MON_EAST LA-2': '3',
-            'MON_EAST LA-3': '4',
-            'MON_MID CITY-1': '5',
-            'MON_MID CITY-2': '6',
-            'MON_MID CITY-3': '7',
-            'MON_ROSECRANS-1': '8',
-            'MON_SOUTH GATE-1': '9',
-            'MON_SAN GABRIEL-2': '10',
-            'MON_ROSECRANS-2': '11',
-            'MON_MID CITY-4': 'VOL-1',
-            'MON_CANYON CNTRY-3': 'VOL-2',
-            
-            # TUE routes
-            'TUE_NO. HOLLYWOOD-2': '1',
-            'TUE_NORTH VALLEY-1': '2',
-            'TUE_NORTH VALLEY-2': '3',
-            'TUE_SILVERLAKE-1': '4',
-            'TUE_SOUTH GATE-2': '5',
-            'TUE_SOUTH GATE-3': '6',
-            'TUE_VERNON-1': '7',
-            'TUE_WAC-1': '8',
-            'TUE_WAC-4': '9',
-            'TUE_VERNON-2': '10',
-            'TUE_SOUTH LA-1': '11',
-            'TUE_NOHO-1': 'VOLUNTEER-1',
-            'TUE_BRAD': 'VOLUNTEER-2',
-            'TUE_THE ELITE': 'VOLUNTEER-3',
-            'TUE_PICK UP LIST': 'VOLUNTEER-4',
-            
-            # WED routes
-            'WED_SOUTH BAY-4': '1',
-            'WED_LAUREL-2': '2',
-            'WED_LONG BEACH-1': '3',
-            'WED_SAN GABRIEL-1': '4',
-            'WED_SEPULVEDA-2': '5',
-            'WED_SILVERLAKE-3': '6',
-            'WED_SOUTH BAY-1': '7',
-            'WED_SOUTHEAST-2': '8',
-            'WED_WAC-2': '9',
-            'WED_WRHAP-1': '10',
-            'WED_SOUTHEAST-4': '11',
-            'WED_LAUREL-1': 'VOLUNTEER-1',
-            'WED_COA NEIGHBORHOOD': 'VOLUNTEER-2',
-            
-            # THU routes
-            'THU_AGAPE-1': '1',
-            'THU_DOWNTOWN-1': '2',
-            'THU_HOLLYWOOD-1': '3',
-            'THU_LA PUENTE-1': '4',
-            'THU_LANCASTER-1': '5',
-            'THU_LANCASTER-2': '6',
-            'THU_SEPULVEDA-1': '7',
-            'THU_SOUTH BAY-2': '8',
-            'THU_SOUTHEAST-1': '9',
-            'THU_WESTSIDE-2': '10',
-            'THU_SOUTH BAY PLUS': '11',
-            'THU_HOLLYWOOD-2': 'VOLUNTEER-1',
-            'THU_PALM PLUS': 'VOLUNTEER-2',
-            
-            # FRI routes
-            'FRI_HOLLYWOOD-3': '1',
-            'FRI_HUNTINGTON PARK-1': '2',
-            'FRI_NORTHEAST-1': '3',
-            'FRI_SOUTH BAY-3': '4',
-            'FRI_SOUTH GATE-4': '5',
-            'FRI_WAC-3': '6',
-            'FRI_WEST VALLEY-1': '7',
-            'FRI_WEST VALLEY-2': '8',
-            'FRI_WEST VALLEY-3': '9',
-            'FRI_SOUTHEAST-3': '10',
-            'FRI_HUNTINGTON PARK-2': '11',
-        }
+        # Progress events posted by the processing thread, applied by the
+        # Tk main loop in poll_progress_events
+        self.progress_events = queue.Queue()
+        
+        # Route assignments saved by the route editor, loaded once at startup
+        self.route_store = RouteStore()
+        try:
+            route_assignments, route_aliases, word_aliases = self.route_store.load()
+        except (OSError, sqlite3.Error) as e:
+            print(f"Could not load saved route assignments: {e}")
+            route_assignments, route_aliases, word_aliases = dict(DEFAULT_ROUTE_ASSIGNMENTS), {}, None
+        
+        # The pipeline itself, reporting progress through the queue
+        self.processor = RouteDataProcessor(
+            route_assignments, progress_callback=self.update_progress, input_cache=ParsedInputCache(),
+            route_aliases=route_aliases, word_aliases=word_aliases
+        )
+        
+        # Files chosen with Browse or dropped on the window
+        self.selected_files = []
+        
+        # Worker processes for jobs, started with the first job. Their
+        # progress arrives on pool_events and is relayed to progress_events.
+        self.pool = None
+        self.pool_manager = None
+        self.pool_events = None
+        # Job id -> input, output and progress of the jobs in the jobs list
+        self.jobs = {}
+        self.next_job_id = 1
+        # Jobs started since the queue was last empty, and their results
+        self.batch = []
+        self.batch_results = []
+        # Output being rewritten with edited route assignments, if any
+        self.reapplying_output = None
         
         # Create UI elements
         self.create_widgets()
+        self.root.after(PROGRESS_POLL_MS, self.poll_progress_events)
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
         
         # Set up drag and drop if available
         try:
@@ -182,6 +1959,32 @@ class BirthdayBagExporter:
             # Drag and drop not available
             self.drop_label.config(text="Click Browse to select your Excel file")
     
+    def finish_startup(self):
+        """
+        Pre-load the processing libraries and, if drag and drop is missing,
+        install it, both in the background after the window has been drawn
+        """
+        threading.Thread(target=prewarm_imports, daemon=True).start()
+        if TkinterDnD is None:
+            threading.Thread(target=self.install_requirements_thread, daemon=True).start()
+    
+    def install_requirements_thread(self):
+        try:
+            if install_requirements():
+                self.progress_events.put(("installed", None))
+        except Exception as e:
+            print(f"Error installing packages: {str(e)}")
+            self.progress_events.put(("install_error", str(e)))
+    
+    @property
+    def route_assignments(self):
+        """Route assignments used by the processor"""
+        return self.processor.route_assignments
+    
+    @route_assignments.setter
+    def route_assignments(self, route_assignments):
+        self.processor.route_assignments = route_assignments
+    
     def apply_theme(self):
         """Apply light or dark theme based on current setting"""
         style = self.style
@@ -200,6 +2003,8 @@ class BirthdayBagExporter:
             style.map("TCheckbutton", background=[("active", "#3d3d3d")])
             style.map("TButton", background=[("active", "#555555")])
             style.map("Accent.TButton", background=[("active", "#0088cc")])
+            style.configure("Treeview", background="#3d3d3d", fieldbackground="#3d3d3d", foreground="#ffffff")
+            style.configure("Treeview.Heading", background="#444444", foreground="#ffffff")
             
             # Configure the drop zone
             style.configure("Drop.TFrame", background="#3d3d3d", bordercolor="#555555")
@@ -215,6 +2020,8 @@ class BirthdayBagExporter:
             style.map("TCheckbutton", background=[("active", "#e5e5e5")])
             style.map("TButton", background=[("active", "#d0d0d0")])
             style.map("Accent.TButton", background=[("active", "#0088cc")])
+            style.configure("Treeview", background="#ffffff", fieldbackground="#ffffff", foreground="#000000")
+            style.configure("Treeview.Heading", background="#e1e1e1", foreground="#000000")
             
             # Configure the drop zone
             style.configure("Drop.TFrame", background="#ffffff", bordercolor="#cccccc")
@@ -288,7 +2095,7 @@ class BirthdayBagExporter:
         file_path_frame = ttk.Frame(content_frame)
         file_path_frame.pack(fill=tk.X, pady=10)
         
-        file_path_label = ttk.Label(file_path_frame, text="Selected File:", font=("Arial", 10, "bold"))
+        file_path_label = ttk.Label(file_path_frame, text="Selected Files:", font=("Arial", 10, "bold"))
         file_path_label.pack(side=tk.LEFT, padx=5)
         
         file_path_entry = ttk.Entry(file_path_frame, textvariable=self.file_path_var, width=50)
@@ -304,10 +2111,15 @@ class BirthdayBagExporter:
         output_label = ttk.Label(output_frame, text="Output File:", font=("Arial", 10, "bold"))
         output_label.pack(side=tk.LEFT, padx=5)
         
-        self.output_var = tk.StringVar(value="Birthday_Bag_Routes.xlsx")
+        self.output_var = tk.StringVar(value=DEFAULT_OUTPUT_NAME)
         output_entry = ttk.Entry(output_frame, textvariable=self.output_var, width=50)
         output_entry.pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
         
+        # Optional Chrome trace of the stage timings, saved next to the output
+        self.save_trace_var = tk.BooleanVar(value=False)
+        trace_check = ttk.Checkbutton(output_frame, text="Save timing trace", variable=self.save_trace_var)
+        trace_check.pack(side=tk.LEFT, padx=5)
+        
         # Button frame
         button_frame = ttk.Frame(content_frame)
         button_frame.pack(fill=tk.X, pady=20)
@@ -321,6 +2133,14 @@ class BirthdayBagExporter:
         )
         process_button.pack(side=tk.LEFT, padx=5)
         
+        # Stops the selected jobs, or all of them
+        cancel_button = ttk.Button(
+            button_frame, 
+            text="Cancel", 
+            command=self.cancel_processing
+        )
+        cancel_button.pack(side=tk.LEFT, padx=5)
+        
         # Route assignments editor button
         edit_button = ttk.Button(
             button_frame, 
@@ -329,6 +2149,37 @@ class BirthdayBagExporter:
         )
         edit_button.pack(side=tk.LEFT, padx=5)
         
+        # Cache of previously parsed exports
+        clear_cache_button = ttk.Button(
+            button_frame, 
+            text="Clear Cache", 
+            command=self.clear_input_cache
+        )
+        clear_cache_button.pack(side=tk.LEFT, padx=5)
+        
+        # Jobs list, one row per file being processed
+        jobs_frame = ttk.Frame(content_frame)
+        jobs_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        self.jobs_tree = ttk.Treeview(jobs_frame, columns=('file', 'output', 'status'), show='headings', height=5)
+        self.jobs_tree.heading('file', text="File", anchor='w')
+        self.jobs_tree.heading('output', text="Output", anchor='w')
+        self.jobs_tree.heading('status', text="Status", anchor='w')
+        self.jobs_tree.column('file', width=180)
+        self.jobs_tree.column('output', width=260)
+        self.jobs_tree.column('status', width=320)
+        jobs_scrollbar = ttk.Scrollbar(jobs_frame, orient="vertical", command=self.jobs_tree.yview)
+        self.jobs_tree.configure(yscrollcommand=jobs_scrollbar.set)
+        self.jobs_tree.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        jobs_scrollbar.pack(side=tk.LEFT, fill=tk.Y)
+        
+        clear_jobs_button = ttk.Button(
+            jobs_frame, 
+            text="Clear Finished", 
+            command=self.clear_finished_jobs
+        )
+        clear_jobs_button.pack(side=tk.LEFT, padx=5, anchor="n")
+        
         # Status frame
         status_frame = ttk.Frame(main_frame)
         status_frame.pack(fill=tk.X, pady=10)
@@ -351,59 +2202,218 @@ class BirthdayBagExporter:
         style.configure("Accent.TButton", font=("Arial", 11, "bold"))
     
     def browse_file(self):
-        file_path = filedialog.askopenfilename(
-            title="Select Birthday Labels File",
+        file_paths = filedialog.askopenfilenames(
+            title="Select Birthday Labels Files",
             filetypes=[("Excel files", "*.xlsx *.xls")]
         )
-        if file_path:
-            self.file_path_var.set(file_path)
+        if file_paths:
+            self.set_input_files(list(file_paths))
     
     def drop(self, event):
-        file_path = event.data
-        # Clean up the file path (remove curly braces and quotes if present)
-        file_path = file_path.strip('{}')
-        if file_path.startswith('"') and file_path.endswith('"'):
-            file_path = file_path[1:-1]
-        
-        if file_path.lower().endswith(('.xlsx', '.xls')):
-            self.file_path_var.set(file_path)
-        else:
+        # Tk hands over dropped files as a Tcl list, with braces around
+        # paths that contain spaces
+        file_paths = self.root.tk.splitlist(event.data)
+        excel_files = [path for path in file_paths if path.lower().endswith(('.xlsx', '.xls'))]
+        
+        if not excel_files:
             messagebox.showerror("Invalid File", "Please drop an Excel file (.xlsx or .xls)")
+            return
+        if len(excel_files) < len(file_paths):
+            messagebox.showwarning("Invalid File", f"Skipped {len(file_paths) - len(excel_files)} file(s) that are not Excel files")
+        self.set_input_files(excel_files)
+    
+    def set_input_files(self, file_paths):
+        self.selected_files = file_paths
+        self.file_path_var.set("; ".join(file_paths))
+    
+    def input_files(self):
+        """The chosen files, or the single path typed into the entry"""
+        text = self.file_path_var.get().strip()
+        if self.selected_files and text == "; ".join(self.selected_files):
+            return list(self.selected_files)
+        return [text] if text else []
     
     def process_file(self):
-        input_file = self.file_path_var.get()
-        output_file = self.output_var.get()
+        input_files = self.input_files()
+        output = self.output_var.get().strip()
         
-        if not input_file:
+        if not input_files:
             messagebox.showerror("Error", "Please select an input file")
             return
         
-        if not output_file:
+        if not output:
             messagebox.showerror("Error", "Please specify an output file name")
             return
         
-        # Start processing in a separate thread to keep UI responsive
-        threading.Thread(target=self.process_file_thread, args=(input_file, output_file), daemon=True).start()
+        # Several files are written next to the named output, each as
+        # "<input name>_Birthday_Bag_Routes.xlsx"
+        if len(input_files) > 1 and output.lower().endswith('.xlsx'):
+            output = os.path.dirname(output) or "."
+        try:
+            output_files = plan_output_paths(input_files, output)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", str(e))
+            return
+        
+        # Two runs writing the same workbook would overwrite each other
+        busy = [path for path in output_files if self.output_busy(path)]
+        if busy:
+            messagebox.showerror(
+                "Error",
+                "These outputs are still being written:\n" + "\n".join(busy) + "\n\nWait for them to finish or cancel them first."
+            )
+            return
+        
+        for input_file, output_file in zip(input_files, output_files):
+            self.submit_job(input_file, output_file)
     
-    def process_file_thread(self, input_file, output_file):
+    def output_busy(self, output_file):
+        """Whether an unfinished job or the route update is writing output_file"""
+        path = os.path.normcase(os.path.abspath(output_file))
+        outputs = [job['output'] for job in self.jobs.values() if not job['finished']]
+        if self.reapplying_output is not None:
+            outputs.append(self.reapplying_output)
+        return any(os.path.normcase(os.path.abspath(other)) == path for other in outputs)
+    
+    def cancel_processing(self):
+        """Cancel the selected unfinished jobs, or all of them if none are selected"""
+        active = [job_id for job_id in self.batch if not self.jobs[job_id]['finished']]
+        selected = {int(iid) for iid in self.jobs_tree.selection()}
+        targets = [job_id for job_id in active if job_id in selected] or active
+        for job_id in targets:
+            job = self.jobs[job_id]
+            job['cancelling'] = True
+            # Queued jobs are dropped; running ones stop at their next check
+            if not job['future'].cancel():
+                job['cancel'].set()
+            self.jobs_tree.set(str(job_id), 'status', "Cancelling...")
+        
+        if self.reapplying_output is not None and self.processor.cancel_event is not None:
+            self.processor.cancel_event.set()
+    
+    def start_worker_pool(self):
+        """Start the worker processes and the thread relaying their progress"""
+        if self.pool is None:
+            self.pool_manager = multiprocessing.Manager()
+            self.pool_events = self.pool_manager.Queue()
+            self.pool = ProcessPoolExecutor(max_workers=GUI_MAX_WORKERS)
+            threading.Thread(target=self.relay_pool_events, args=(self.pool_events,), daemon=True).start()
+        return self.pool
+    
+    def relay_pool_events(self, pool_events):
+        """Forward progress posted by the worker processes to the Tk main loop"""
+        while True:
+            try:
+                event = pool_events.get()
+            except (EOFError, OSError):
+                # The manager was shut down
+                return
+            if event is None:
+                return
+            self.progress_events.put(event)
+    
+    def submit_job(self, input_file, output_file):
+        """Queue one file for the worker pool and list it in the jobs list"""
+        job_id = self.next_job_id
+        self.next_job_id += 1
+        trace_file = trace_path_for(output_file) if self.save_trace_var.get() else None
+        
+        pool = self.start_worker_pool()
+        cancel_event = self.pool_manager.Event()
+        future = pool.submit(
+            process_route_job, job_id, input_file, output_file, dict(self.route_assignments),
+            dict(self.processor.route_aliases), dict(self.processor.word_aliases), trace_file, self.pool_events,
+            cancel_event
+        )
+        
+        self.jobs[job_id] = {
+            'input': input_file, 'output': output_file, 'progress': 0, 'finished': False,
+            'future': future, 'cancel': cancel_event, 'cancelling': False,
+        }
+        self.batch.append(job_id)
+        self.jobs_tree.insert('', 'end', iid=str(job_id), values=(os.path.basename(input_file), output_file, "Queued"))
+        future.add_done_callback(lambda future: self.progress_events.put(("job_finished", job_id, future)))
+    
+    def job_progress(self, job_id, value, message):
+        job = self.jobs.get(job_id)
+        if job is None or job['finished'] or job['cancelling']:
+            return
+        if value is not None:
+            job['progress'] = value
+        status = f"{job['progress']:.0f}%" + (f" {message}" if message else "")
+        self.jobs_tree.set(str(job_id), 'status', status)
+    
+    def job_finished(self, job_id, future):
+        job = self.jobs[job_id]
+        job['finished'] = True
+        job['progress'] = 100
         try:
-            self.status_var.set("Processing...")
-            self.progress["value"] = 0
-            self.root.update_idletasks()
-            
-            # Process the file
-            self.process_route_data(input_file, output_file)
-            
-            self.status_var.set(f"Done! Output saved to {output_file}")
-            self.progress["value"] = 100
-            self.root.update_idletasks()
-            
-            # Show success message in the main thread
-            self.root.after(0, lambda: messagebox.showinfo("Success", f"File processed successfully!\nOutput saved to {output_file}"))
+            trace, run_state = future.result()
+        except (CancelledError, ProcessingCancelled):
+            job['cancelled'] = True
+            self.jobs_tree.set(str(job_id), 'status', "Cancelled")
+            self.batch_results.append((job, None))
+            return
         except Exception as e:
-            err_msg = str(e)
-            self.status_var.set(f"Error: {err_msg}")
-            self.root.after(0, lambda: messagebox.showerror("Error", f"An error occurred: {err_msg}"))
+            self.jobs_tree.set(str(job_id), 'status', f"Error: {e}")
+            self.batch_results.append((job, str(e)))
+            return
+        
+        # Route edits are applied to the most recently finished output
+        self.processor.last_trace = trace
+        self.processor.last_run = run_state
+        self.jobs_tree.set(str(job_id), 'status', f"Done ({trace.summary()})")
+        self.batch_results.append((job, None))
+    
+    def finish_batch(self):
+        """Report the jobs started since the queue was last empty"""
+        self.batch = []
+        self.batch_results, results = [], self.batch_results
+        
+        # Cancelled jobs need no dialog
+        cancelled = [job for job, _ in results if job.get('cancelled')]
+        results = [(job, error) for job, error in results if not job.get('cancelled')]
+        if not results:
+            self.update_progress(0, f"Cancelled {len(cancelled)} file(s)")
+            return
+        
+        failed = [(job, error) for job, error in results if error is not None]
+        if len(results) == 1 and not cancelled:
+            job, error = results[0]
+            if error is None:
+                self.update_progress(100, f"Done! Output saved to {job['output']} ({self.processor.last_trace.summary()})")
+                messagebox.showinfo("Success", f"File processed successfully!\nOutput saved to {job['output']}")
+            else:
+                self.update_progress(None, f"Error: {error}")
+                messagebox.showerror("Error", f"An error occurred: {error}")
+        elif failed:
+            self.update_progress(100, f"Processed {len(results) - len(failed)} of {len(results) + len(cancelled)} files")
+            details = "\n".join(f"{os.path.basename(job['input'])}: {error}" for job, error in failed)
+            messagebox.showerror("Error", f"{len(failed)} of {len(results)} files could not be processed:\n{details}")
+        else:
+            self.update_progress(100, f"Processed {len(results)} of {len(results) + len(cancelled)} files")
+            messagebox.showinfo("Success", f"{len(results)} file(s) processed successfully!")
+    
+    def clear_finished_jobs(self):
+        for job_id, job in list(self.jobs.items()):
+            if job['finished'] and job_id not in self.batch:
+                del self.jobs[job_id]
+                self.jobs_tree.delete(str(job_id))
+    
+    def close(self):
+        """Stop the worker processes and close the window"""
+        if self.pool is not None:
+            # Drop the jobs that have not started yet
+            for job in self.jobs.values():
+                job['future'].cancel()
+            self.pool.shutdown(wait=False)
+            self.pool_events.put(None)
+            self.pool_manager.shutdown()
+        self.root.destroy()
+    
+    def clear_input_cache(self):
+        removed = self.processor.input_cache.clear()
+        messagebox.showinfo("Cache Cleared", f"Removed {removed} cached file(s).")
     
     def open_route_editor(self):
         # Create a new window for editing route assignments
@@ -429,83 +2439,37 @@ class BirthdayBagExporter:
         )
         header_label.pack(pady=(0, 20))
         
-        # Create a notebook for tabs (one tab per day)
+        # Routes of each day in assignment order, edited as plain strings
+        day_data = {day: dict(routes) for day, routes in assignments_by_day(self.route_assignments).items()}
+        days = ['SUN', 'MON', 'TUE', 'WED', 'THU', 'FRI']
+        days += [day for day in day_data if day not in days]
+        for day in days:
+            day_data.setdefault(day, {})
+        # Word aliases, edited on their own tab after the days
+        word_aliases = dict(self.processor.word_aliases)
+        
+        # Create a notebook for tabs (one tab per day). A tab's widgets are
+        # built the first time it is selected.
         notebook = ttk.Notebook(editor_frame)
         notebook.pack(fill=tk.BOTH, expand=True)
         
-        # Create tabs for each day
-        days = ['SUN', 'MON', 'TUE', 'WED', 'THU', 'FRI']
         day_frames = {}
-        day_data = {}
+        tables = {}
+        
+        def build_selected_tab(event=None):
+            day = notebook.tab(notebook.select(), 'text')
+            if day in tables:
+                return
+            if day == ALIASES_TAB:
+                tables[day] = self.build_alias_tab(day_frames[day], word_aliases)
+            else:
+                tables[day] = self.build_route_tab(day_frames[day], day_data[day])
         
-        for day in days:
-            # Create a frame for this day
+        for day in days + [ALIASES_TAB]:
             day_frames[day] = ttk.Frame(notebook, padding="15")
             notebook.add(day_frames[day], text=day)
-            
-            # Create a scrollable frame
-            canvas = tk.Canvas(day_frames[day], highlightthickness=0)
-            if self.dark_mode.get():
-                canvas.configure(bg="#2d2d2d")
-            else:
-                canvas.configure(bg="#f5f5f5")
-                
-            scrollbar = ttk.Scrollbar(day_frames[day], orient="vertical", command=canvas.yview)
-            scrollable_frame = ttk.Frame(canvas)
-            
-            scrollable_frame.bind(
-                "<Configure>",
-                lambda e, canvas=canvas: canvas.configure(
-                    scrollregion=canvas.bbox("all")
-                )
-            )
-            
-            canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-            canvas.configure(yscrollcommand=scrollbar.set)
-            
-            canvas.pack(side="left", fill="both", expand=True)
-            scrollbar.pack(side="right", fill="y")
-            
-            # Create headers
-            ttk.Label(scrollable_frame, text="Van Number", font=("Arial", 11, "bold")).grid(row=0, column=0, padx=5, pady=5, sticky="w")
-            ttk.Label(scrollable_frame, text="Route Name", font=("Arial", 11, "bold")).grid(row=0, column=1, padx=5, pady=5, sticky="w")
-            
-            # Get routes for this day
-            day_routes = {k.split('_', 1)[1]: v for k, v in self.route_assignments.items() if k.startswith(f"{day}_")}
-            day_data[day] = {}
-            
-            # Sort routes by van number
-            sorted_routes = sorted(day_routes.items(), key=lambda x: self.sort_key(x[1]))
-            
-            # Create entry fields for each route
-            row = 1
-            for route, van in sorted_routes:
-                van_var = tk.StringVar(value=van)
-                day_data[day][route] = van_var
-                
-                ttk.Entry(scrollable_frame, textvariable=van_var, width=10).grid(row=row, column=0, padx=5, pady=2)
-                ttk.Label(scrollable_frame, text=route).grid(row=row, column=1, padx=5, pady=2, sticky="w")
-                row += 1
-            
-            # Add button to add new route
-            add_frame = ttk.Frame(scrollable_frame)
-            add_frame.grid(row=row, column=0, columnspan=2, pady=20, sticky="w")
-            
-            ttk.Label(add_frame, text="Add New Route:", font=("Arial", 10, "bold")).pack(side=tk.LEFT, padx=5)
-            
-            new_van_var = tk.StringVar()
-            ttk.Label(add_frame, text="Van #:").pack(side=tk.LEFT, padx=5)
-            ttk.Entry(add_frame, textvariable=new_van_var, width=10).pack(side=tk.LEFT, padx=5)
-            
-            new_route_var = tk.StringVar()
-            ttk.Label(add_frame, text="Route Name:").pack(side=tk.LEFT, padx=5)
-            ttk.Entry(add_frame, textvariable=new_route_var, width=20).pack(side=tk.LEFT, padx=5)
-            
-            ttk.Button(
-                add_frame, 
-                text="Add", 
-                command=lambda d=day, r=new_route_var, v=new_van_var, sf=scrollable_frame, dd=day_data: self.add_route(d, r, v, sf, dd)
-            ).pack(side=tk.LEFT, padx=5)
+        notebook.bind('<<NotebookTabChanged>>', build_selected_tab)
+        build_selected_tab()
         
         # Button frame
         button_frame = ttk.Frame(editor_frame)
@@ -515,7 +2479,7 @@ class BirthdayBagExporter:
         save_button = ttk.Button(
             button_frame, 
             text="Save Changes", 
-            command=lambda: self.save_route_assignments(day_data, editor_window),
+            command=lambda: self.save_route_assignments(day_data, editor_window, tables.values(), word_aliases),
             style="Accent.TButton"
         )
         save_button.pack(side=tk.LEFT, padx=5)
@@ -528,19 +2492,88 @@ class BirthdayBagExporter:
         )
         cancel_button.pack(side=tk.LEFT, padx=5)
     
-    def sort_key(self, van):
-        """Helper function to sort van numbers correctly"""
-        if van.isdigit():
-            return int(van)
-        elif van.startswith('VOLUNTEER-') and van[10:].isdigit():
-            return 100 + int(van[10:])  # Put VOLUNTEER-# after numeric vans
-        elif van.startswith('VOL-') and van[4:].isdigit():
-            return 100 + int(van[4:])  # Put VOL-# after numeric vans
-        else:
-            # For other non-numeric values, put them at the end
-            return float('inf')
+    def build_route_tab(self, day_frame, routes):
+        """Fill a day's tab with its route table and the form for adding routes"""
+        # Add button to add new route
+        add_frame = ttk.Frame(day_frame)
+        add_frame.pack(side=tk.BOTTOM, fill=tk.X, pady=(15, 0))
+        
+        table_frame = ttk.Frame(day_frame)
+        table_frame.pack(fill=tk.BOTH, expand=True)
+        table = RouteTable(table_frame, routes, self.processor.sort_key)
+        
+        ttk.Label(add_frame, text="Add New Route:", font=("Arial", 10, "bold")).pack(side=tk.LEFT, padx=5)
+        
+        new_van_var = tk.StringVar()
+        ttk.Label(add_frame, text="Van #:").pack(side=tk.LEFT, padx=5)
+        ttk.Entry(add_frame, textvariable=new_van_var, width=10).pack(side=tk.LEFT, padx=5)
+        
+        new_route_var = tk.StringVar()
+        ttk.Label(add_frame, text="Route Name:").pack(side=tk.LEFT, padx=5)
+        ttk.Entry(add_frame, textvariable=new_route_var, width=20).pack(side=tk.LEFT, padx=5)
+        
+        ttk.Button(
+            add_frame, 
+            text="Add", 
+            command=lambda: self.add_route(table, new_route_var, new_van_var)
+        ).pack(side=tk.LEFT, padx=5)
+        
+        return table
+    
+    def build_alias_tab(self, alias_frame, word_aliases):
+        """Fill the aliases tab with the word alias table and the form for adding aliases"""
+        ttk.Label(
+            alias_frame, wraplength=800,
+            text="Route names are read with each spelling below replaced by the words it stands for, "
+                 "so different spellings of a route get the same van."
+        ).pack(side=tk.TOP, anchor='w', pady=(0, 10))
+        
+        add_frame = ttk.Frame(alias_frame)
+        add_frame.pack(side=tk.BOTTOM, fill=tk.X, pady=(15, 0))
+        
+        table_frame = ttk.Frame(alias_frame)
+        table_frame.pack(fill=tk.BOTH, expand=True)
+        table = WordAliasTable(table_frame, word_aliases)
+        
+        ttk.Label(add_frame, text="Add Alias:", font=("Arial", 10, "bold")).pack(side=tk.LEFT, padx=5)
+        
+        alias_var = tk.StringVar()
+        ttk.Label(add_frame, text="Spelling:").pack(side=tk.LEFT, padx=5)
+        ttk.Entry(add_frame, textvariable=alias_var, width=12).pack(side=tk.LEFT, padx=5)
+        
+        words_var = tk.StringVar()
+        ttk.Label(add_frame, text="Stands For:").pack(side=tk.LEFT, padx=5)
+        ttk.Entry(add_frame, textvariable=words_var, width=20).pack(side=tk.LEFT, padx=5)
+        
+        ttk.Button(
+            add_frame,
+            text="Add",
+            command=lambda: self.add_word_alias(table, alias_var, words_var)
+        ).pack(side=tk.LEFT, padx=5)
+        ttk.Button(add_frame, text="Remove Selected", command=table.remove_selected).pack(side=tk.LEFT, padx=5)
+        
+        # Double-clicking an alias fills the form, so it can be changed and added again
+        table.tree.bind('<Double-1>', lambda event: table.fill_form(alias_var, words_var))
+        
+        return table
+    
+    def add_word_alias(self, table, alias_var, words_var):
+        alias = RouteStore.normalize(alias_var.get())
+        words = RouteStore.normalize(words_var.get())
+        
+        if not alias or not words:
+            messagebox.showerror("Error", "Please enter both the spelling and the words it stands for")
+            return
+        if not ROUTE_WORD_PATTERN.fullmatch(alias):
+            messagebox.showerror("Error", "A spelling must be a single word, without spaces or dashes")
+            return
+        
+        table.set_alias(alias, words)
+        
+        alias_var.set("")
+        words_var.set("")
     
-    def add_route(self, day, route_var, van_var, scrollable_frame, day_data):
+    def add_route(self, table, route_var, van_var):
         route = route_var.get().strip()
         van = van_var.get().strip()
         
@@ -548,376 +2581,653 @@ class BirthdayBagExporter:
             messagebox.showerror("Error", "Please enter both route name and van number")
             return
         
-        # Add to the UI - need to recreate the entire list to maintain sorting
-        day_data[day][route] = tk.StringVar(value=van)
-        
-        # Clear all existing route entries
-        for widget in scrollable_frame.winfo_children():
-            if isinstance(widget, ttk.Frame):  # Keep the add frame
-                continue
-            widget.destroy()
-        
-        # Recreate headers
-        ttk.Label(scrollable_frame, text="Van Number", font=("Arial", 11, "bold")).grid(row=0, column=0, padx=5, pady=5, sticky="w")
-        ttk.Label(scrollable_frame, text="Route Name", font=("Arial", 11, "bold")).grid(row=0, column=1, padx=5, pady=5, sticky="w")
-        
-        # Sort routes by van number
-        sorted_routes = sorted(day_data[day].items(), key=lambda x: self.sort_key(x[1].get()))
+        # Insert the row at its place in van order
+        table.set_van(route, van)
         
-        # Recreate all route entries
-        row = 1
-        for route_name, existing_van_var in sorted_routes:
-            ttk.Entry(scrollable_frame, textvariable=existing_van_var, width=10).grid(row=row, column=0, padx=5, pady=2)
-            ttk.Label(scrollable_frame, text=route_name).grid(row=row, column=1, padx=5, pady=2, sticky="w")
-            row += 1
-
         # Clear entry fields
         route_var.set("")
         van_var.set("")
     
-    def save_route_assignments(self, day_data, editor_window):
+    def save_route_assignments(self, day_data, editor_window, tables=(), word_aliases=None):
+        # Keep a van number that is still being edited
+        for table in tables:
+            table.commit_edit()
+        
         # Update the route assignments dictionary
         new_assignments = {}
         
         for day, routes in day_data.items():
-            for route, van_var in routes.items():
+            for route, van in routes.items():
                 key = f"{day}_{route}"
-                new_assignments[key] = van_var.get()
+                new_assignments[key] = van
         
-        self.route_assignments = new_assignments
-        messagebox.showinfo("Success", "Route assignments saved successfully!")
-        editor_window.destroy()
-    
-    def extract_client_data(self, report_file):
-        """
-        Extract client data from Sheet1 of the Report file
-        This function will extract client names and their routes
-        """
-        self.update_progress(10, "Extracting client data...")
+        if word_aliases is None or word_aliases == self.processor.word_aliases:
+            word_aliases = None
         
-        # Read the Excel file
-        df = pd.read_excel(report_file, sheet_name='Sheet1', header=None)
-        
-        # Initialize lists to store extracted data
-        clients = []
-        routes = []
-        
-        # Iterate through the dataframe to extract client and route information
-        i = 0
-        while i < len(df):
-            # Check if this row contains "Happy Birthday!"
-            if isinstance(df.iloc[i, 0], str) and "Happy Birthday!" in df.iloc[i, 0]:
-                # Next row should contain client name
-                if i + 1 < len(df):
-                    client_name = df.iloc[i + 1, 0]
-                    
-                    # Look for route information in nearby rows (up to 5 rows after client name)
-                    route_found = False
-                    for j in range(i + 2, min(i + 7, len(df))):
-                        for col in range(df.shape[1]):
-                            if pd.notna(df.iloc[j, col]) and isinstance(df.iloc[j, col], str):
-                                match = ROUTE_PATTERN.search(df.iloc[j, col])
-                                if match and not route_found:
-                                    day = match.group(1)
-                                    route_name = match.group(2)
-                                    full_route = f"{day} | {route_name}"
-                                    clients.append(client_name)
-                                    routes.append(full_route)
-                                    route_found = True
-                                    break
-                        if route_found:
-                            break
-            i += 1
-        
-        # Create a dataframe with the extracted data
-        client_data = pd.DataFrame({
-            'Client': clients,
-            'Route': routes
-        })
+        # Route order matters for partial matches, so compare it too
+        if list(new_assignments.items()) == list(self.route_assignments.items()) and word_aliases is None:
+            messagebox.showinfo("Success", "Route assignments saved successfully!")
+            editor_window.destroy()
+            return
         
-        return client_data
-    
-    def match_clients_to_vans(self, client_data):
-        """
-        Match clients to van numbers based on their routes
-        """
-        self.update_progress(30, "Matching clients to vans...")
+        self.route_assignments = new_assignments
+        if word_aliases is not None:
+            self.processor.word_aliases = word_aliases
+        editor_window.destroy()
         
-        # Initialize list to store van numbers
-        van_numbers = []
+        # Only the rows that changed are written
+        try:
+            self.route_store.save(new_assignments, word_aliases)
+        except (OSError, sqlite3.Error) as e:
+            messagebox.showerror("Error", f"Route assignments could not be saved and will be lost when the app closes: {e}")
         
-        # Process each client
-        for _, row in client_data.iterrows():
-            route = row['Route']
-            # Extract day and route name
-            match = ROUTE_PATTERN.match(route)
-            if match:
-                day = match.group(1)
-                route_name = match.group(2).strip()
-                
-                # Clean route name for matching
-                cleaned_route = self.clean_route_name(route_name)
-                
-                # Try to find a match in route assignments
-                van_num = self.find_van_for_route(day, cleaned_route)
-                
-                van_numbers.append(van_num if van_num else "")
-            else:
-                van_numbers.append("")
+        if self.processor.last_run is None:
+            messagebox.showinfo("Success", "Route assignments saved successfully!")
+            return
         
-        # Add van numbers to client data
-        client_data['VAN #'] = van_numbers
+        output_file = self.processor.last_run.output_file
+        if self.output_busy(output_file):
+            messagebox.showinfo("Success", f"Route assignments saved successfully!\n{output_file} is still being written, so they will apply to the next run.")
+            return
         
-        return client_data
+        # Update the last output with the new van numbers right away
+        self.reapplying_output = output_file
+        self.processor.cancel_event = threading.Event()
+        threading.Thread(target=self.reapply_routes_thread, args=(output_file,), daemon=True).start()
     
-    def clean_route_name(self, route_name):
-        """
-        Clean and standardize route names for better matching
-        """
-        # Remove any text in parentheses
-        cleaned = re.sub(r'\s*\(.*?\)', '', route_name)
-        # Remove [FULL] tag
-        cleaned = re.sub(r'\[FULL\]\s*', '', cleaned)
-        # Remove extra spaces
-        cleaned = re.sub(r'\s+', ' ', cleaned).strip()
-        # Convert to uppercase for case-insensitive comparison
-        return cleaned.upper()
+    def reapply_routes_thread(self, output_file):
+        try:
+            self.processor.reapply_route_assignments()
+            self.update_progress(100, f"Route changes applied to {output_file} ({self.processor.last_trace.summary()})")
+            self.progress_events.put(("done", output_file))
+        except ProcessingCancelled:
+            self.update_progress(None, f"Route changes were not applied to {output_file}")
+            self.progress_events.put(("cancelled", output_file))
+        except Exception as e:
+            err_msg = str(e)
+            self.update_progress(None, f"Error: {err_msg}")
+            self.progress_events.put(("error", err_msg))
     
-    def find_van_for_route(self, day, route_name):
+    def update_progress(self, value, message=None):
         """
-        Find the van number for a given day and route name
+        Update progress bar and status message. This is called from the
+        processing thread, so the update is queued for the Tk main loop.
         """
-        # Try exact match first
-        key = f"{day}_{route_name}"
-        if key in self.route_assignments:
-            return self.route_assignments[key]
-        
-        # Try to match the base route name
-        base_route = self.extract_route_base(route_name)
-        for k, v in self.route_assignments.items():
-            if k.startswith(f"{day}_") and base_route in k:
-                return v
+        self.progress_events.put(("progress", value, message))
+
+    def poll_progress_events(self):
+        """Apply queued progress events from the Tk main loop"""
+        self.root.after(PROGRESS_POLL_MS, self.poll_progress_events)
+        
+        # Only the latest progress since the last poll gets drawn
+        value = None
+        message = None
+        job_updates = {}
+        results = []
+        while True:
+            try:
+                event = self.progress_events.get_nowait()
+            except queue.Empty:
+                break
+            if event[0] == "progress":
+                if event[1] is not None:
+                    value = event[1]
+                if event[2]:
+                    message = event[2]
+            elif event[0] == "job":
+                _, job_id, job_value, job_message = event
+                previous_value, previous_message = job_updates.get(job_id, (None, None))
+                job_updates[job_id] = (job_value if job_value is not None else previous_value,
+                                       job_message or previous_message)
+            elif event[0] == "job_finished":
+                self.job_finished(event[1], event[2])
+            else:
+                results.append(event)
+        
+        for job_id, (job_value, job_message) in job_updates.items():
+            self.job_progress(job_id, job_value, job_message)
+        # Worker progress and finished jobs arrive on separate channels, so
+        # a job's last progress can come after its batch has been finished
+        if job_updates and self.batch:
+            # The progress bar follows the whole batch
+            value = sum(self.jobs[job_id]['progress'] for job_id in self.batch) / len(self.batch)
+            job_id, (_, job_message) = list(job_updates.items())[-1]
+            if job_message and job_id in self.batch:
+                message = f"{os.path.basename(self.jobs[job_id]['input'])}: {job_message}"
+        
+        if value is not None:
+            self.progress["value"] = value
+        if message:
+            self.status_var.set(message)
         
-        # Try partial matching
-        for k, v in self.route_assignments.items():
-            if k.startswith(f"{day}_"):
-                route_part = k.split('_', 1)[1]
-                if base_route in route_part or route_part in base_route:
-                    return v
+        if self.batch and all(self.jobs[job_id]['finished'] for job_id in self.batch):
+            self.finish_batch()
         
-        return ""
+        for kind, detail in results:
+            if kind in ("done", "error", "cancelled"):
+                # The route update has finished
+                self.reapplying_output = None
+            if kind == "cancelled":
+                continue
+            if kind == "done":
+                messagebox.showinfo("Success", f"File processed successfully!\nOutput saved to {detail}")
+            elif kind == "installed":
+                messagebox.showinfo("Setup Complete", "Required packages have been installed. Please restart the application to use drag and drop.")
+            elif kind == "install_error":
+                messagebox.showerror("Installation Error", f"Error installing required packages: {detail}\n\nPlease run 'pip install -r requirements.txt' manually.")
+            else:
+                messagebox.showerror("Error", f"An error occurred: {detail}")
+
+
+def expand_input_paths(patterns):
+    """
+    Expand glob patterns into file paths, keeping the order given and
+    dropping duplicates
+    """
+    paths = []
+    for pattern in patterns:
+        if any(char in pattern for char in '*?['):
+            matches = sorted(glob.glob(pattern))
+            if not matches:
+                raise FileNotFoundError(f"No files match {pattern}")
+        else:
+            if not os.path.isfile(pattern):
+                raise FileNotFoundError(f"No such file: {pattern}")
+            matches = [pattern]
+        for path in matches:
+            if path not in paths:
+                paths.append(path)
+    return paths
+
+
+def plan_output_paths(input_files, output):
+    """
+    Pick an output workbook for each input. A single input may be written
+    to an explicit .xlsx path; otherwise output names a directory that
+    receives one "<input name>_Birthday_Bag_Routes.xlsx" per input.
+    """
+    if output is None:
+        output = DEFAULT_OUTPUT_NAME if len(input_files) == 1 else "."
     
-    def extract_route_base(self, route_name):
+    if len(input_files) == 1 and output.lower().endswith('.xlsx') and not os.path.isdir(output):
+        return [output]
+    
+    os.makedirs(output, exist_ok=True)
+    output_files = [
+        os.path.join(output, f"{os.path.splitext(os.path.basename(path))[0]}_{DEFAULT_OUTPUT_NAME}")
+        for path in input_files
+    ]
+    if len(set(output_files)) < len(output_files):
+        raise ValueError("Several input files have the same name; process them into separate output directories")
+    return output_files
+
+
+def open_inotify(directory):
+    """
+    Non-blocking inotify descriptor that becomes readable when files in
+    directory are written, created or moved in, or None where inotify is
+    not available
+    """
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        import ctypes
+        import ctypes.util
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    except (OSError, AttributeError):
+        return None
+    if fd < 0:
+        return None
+    
+    IN_MODIFY, IN_CLOSE_WRITE, IN_MOVED_TO, IN_CREATE = 0x002, 0x008, 0x080, 0x100
+    mask = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+    if libc.inotify_add_watch(fd, os.fsencode(directory), mask) < 0:
+        os.close(fd)
+        return None
+    return fd
+
+
+class FolderWatcher:
+    """
+    Finds label exports in a directory once they have finished being
+    written. A file counts as finished when its size and modification
+    time have not changed for settle_seconds, so exports still being
+    copied or saved are left alone. Uses inotify on Linux to notice new
+    files as they arrive and falls back to polling elsewhere.
+    """
+
+    def __init__(self, directory, settle_seconds=WATCH_SETTLE_SECONDS, poll_seconds=WATCH_POLL_SECONDS):
+        self.directory = directory
+        self.settle_seconds = settle_seconds
+        self.poll_seconds = poll_seconds
+        # path -> ((size, mtime_ns), time the signature was first seen)
+        self.pending = {}
+        # path -> signature of the file when it was last reported
+        self.reported = {}
+        self.inotify_fd = open_inotify(directory)
+
+    def close(self):
+        if self.inotify_fd is not None:
+            os.close(self.inotify_fd)
+            self.inotify_fd = None
+
+    def candidates(self):
+        """(path, (size, mtime_ns)) of the exports in the directory"""
+        found = []
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                # Skip hidden files and the lock files Excel keeps next to open workbooks
+                if entry.name.startswith(('.', '~$')) or not entry.name.lower().endswith(WATCH_EXTENSIONS):
+                    continue
+                try:
+                    if not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                found.append((entry.path, (stat.st_size, stat.st_mtime_ns)))
+        return found
+
+    def settled_files(self):
         """
-        Extract the base part of the route name (e.g., "SOUTH BAY" from "SOUTH BAY-1")
+        Paths of exports that are new or changed since they were last
+        reported and have stopped changing
         """
-        # Extract the part before any dash or number
-        match = re.match(r'([A-Za-z\s]+)', route_name)
-        if match:
-            return match.group(1).strip()
-        return route_name
-    
-    def order_by_day_and_van(self, client_data):
+        now = time.monotonic()
+        settled = []
+        present = set()
+        for path, signature in self.candidates():
+            present.add(path)
+            if self.reported.get(path) == signature:
+                continue
+            seen = self.pending.get(path)
+            if seen is None or seen[0] != signature:
+                self.pending[path] = (signature, now)
+            elif now - seen[1] >= self.settle_seconds:
+                del self.pending[path]
+                self.reported[path] = signature
+                settled.append(path)
+        
+        # Forget files that were removed, so they are picked up again if they come back
+        for path in set(self.pending) - present:
+            del self.pending[path]
+        for path in set(self.reported) - present:
+            del self.reported[path]
+        return sorted(settled)
+
+    def wait(self, timeout=None):
         """
-        Order the client data by day of week and then by van number
+        Sleep until the next scan is due: after the poll interval, sooner
+        while files are settling, or as soon as inotify reports a change
         """
-        self.update_progress(50, "Ordering by day and van...")
+        if timeout is None:
+            timeout = self.poll_seconds
+        if self.pending:
+            timeout = min(timeout, self.settle_seconds / 4)
+        if self.inotify_fd is None:
+            time.sleep(timeout)
+            return
         
-        # Define day order
-        day_order = {
-            'SUN': 0,
-            'MON': 1,
-            'TUE': 2,
-            'WED': 3,
-            'THU': 4,
-            'FRI': 5,
-            'SAT': 6
+        import select
+        readable, _, _ = select.select([self.inotify_fd], [], [], timeout)
+        if readable:
+            # The events only prompt a rescan, so they are read and dropped
+            try:
+                while os.read(self.inotify_fd, 65536):
+                    pass
+            except BlockingIOError:
+                pass
+
+
+class ProcessedLedger:
+    """
+    Content hashes of the exports a watched folder has already converted,
+    kept in a JSON file so restarts and renamed copies do not process an
+    export twice
+    """
+
+    def __init__(self, path):
+        self.path = path
+        try:
+            with open(path, encoding='utf-8') as f:
+                entries = json.load(f)
+            if not isinstance(entries, dict):
+                raise ValueError("not a JSON object")
+        except FileNotFoundError:
+            entries = {}
+        except ValueError as e:
+            # A damaged ledger only means exports already converted are converted again
+            print(f"{path}: unreadable ledger, starting an empty one: {e}", file=sys.stderr)
+            entries = {}
+        self.entries = entries
+
+    def __contains__(self, content_hash):
+        return content_hash in self.entries
+
+    def record(self, content_hash, input_file, output_file):
+        self.entries[content_hash] = {
+            'input': os.path.basename(input_file),
+            'output': os.path.basename(output_file),
+            'processed': time.strftime('%Y-%m-%dT%H:%M:%S'),
         }
-        
-        # Extract day from route
-        client_data['Day'] = client_data['Route'].apply(
-            lambda x: DAY_PATTERN.match(x).group(1) if DAY_PATTERN.match(x) else ""
-        )
-        
-        # Convert van numbers to integers for sorting (if possible)
-        client_data['VAN_SORT'] = client_data['VAN #'].apply(
-            lambda x: int(x) if isinstance(x, str) and x.isdigit() else float('inf')
-        )
-        
-        # Map days to their order
-        client_data['DAY_SORT'] = client_data['Day'].map(day_order)
-        
-        # Sort by day and then by van number
-        client_data = client_data.sort_values(['DAY_SORT', 'VAN_SORT'])
-        
-        # Drop temporary columns
-        client_data = client_data.drop(['DAY_SORT', 'VAN_SORT'], axis=1)
-        
-        return client_data
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, indent=1)
+        os.replace(temp_path, self.path)
+
+
+def watch_output_dir(directory):
+    """The "processed" folder next to a watched folder"""
+    return os.path.join(os.path.dirname(os.path.abspath(directory)), WATCH_OUTPUT_FOLDER)
+
+
+def run_watch(directory, output_dir, jobs, route_assignments, route_aliases, word_aliases, trace=False,
+              use_cache=True, engine='pandas', once=False, watcher=None):
+    """
+    Convert exports as they appear in directory, writing
+    "<input name>_Birthday_Bag_Routes.xlsx" into output_dir, until
+    interrupted. With once, stop when the exports already there are done.
+    Returns the exit status: 1 if an export failed in once mode, else 0.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    ledger = ProcessedLedger(os.path.join(output_dir, WATCH_LEDGER_NAME))
+    watcher = watcher or FolderWatcher(directory)
+    # future -> (input file, output file, content hash)
+    running = {}
+    failures = 0
     
-    def format_output(self, client_data):
-        """
-        Format the output to match Sheet2 format
-        """
-        self.update_progress(60, "Formatting output...")
-        
-        # Reorder columns
-        formatted_data = client_data[['VAN #', 'Client', 'Route', 'Day']]
-        
-        # Rename columns
-        formatted_data = formatted_data.rename(columns={'Route': 'Route Name & Day'})
-        
-        # Add Notes column
-        formatted_data['Notes'] = ""
-        
-        return formatted_data
+    mode = "inotify" if watcher.inotify_fd is not None else f"polling every {watcher.poll_seconds:g}s"
+    print(f"Watching {directory} ({mode}); writing to {output_dir}", file=sys.stderr)
     
-    def add_day_separators(self, formatted_data):
-        """
-        Add empty rows between different days to match the Sheet2 format
-        """
-        self.update_progress(70, "Adding day separators...")
-        
-        # Get unique days in order
-        days = formatted_data['Day'].unique()
-        
-        # Create a new dataframe with separators
-        result = []
-        
-        for day in days:
-            # Get rows for this day
-            day_rows = formatted_data[formatted_data['Day'] == day]
-            
-            # Add rows to result
-            for _, row in day_rows.iterrows():
-                result.append(row)
-            
-            # Add separator row (except after the last day)
-            if day != days[-1]:
-                # Add a single black bar row with the day value for identification
-                separator_row = pd.Series({'VAN #': '', 'Client': '', 'Route Name & Day': '', 'Notes': '', 'Day': f"SEPARATOR_{day}"})
-                result.append(separator_row)
-        
-        # Convert result to dataframe
-        result_df = pd.DataFrame(result)
-        
-        return result_df
+    try:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            while True:
+                running_hashes = {content_hash for _, _, content_hash in running.values()}
+                for input_file in watcher.settled_files():
+                    try:
+                        content_hash = file_content_hash(input_file)
+                    except OSError as e:
+                        print(f"{input_file}: error: {e}", file=sys.stderr)
+                        continue
+                    if content_hash in ledger or content_hash in running_hashes:
+                        print(f"{input_file}: already converted, skipped", file=sys.stderr)
+                        continue
+                    
+                    name = os.path.splitext(os.path.basename(input_file))[0]
+                    output_file = os.path.join(output_dir, f"{name}_{DEFAULT_OUTPUT_NAME}")
+                    trace_file = trace_path_for(output_file) if trace else None
+                    future = pool.submit(process_route_file, input_file, output_file, route_assignments, trace_file,
+                                         use_cache=use_cache, engine=engine, route_aliases=route_aliases,
+                                         word_aliases=word_aliases)
+                    running[future] = (input_file, output_file, content_hash)
+                    running_hashes.add(content_hash)
+                
+                for future in [future for future in running if future.done()]:
+                    input_file, output_file, content_hash = running.pop(future)
+                    try:
+                        print(f"{input_file} -> {output_file} ({future.result().summary()})")
+                    except Exception as e:
+                        # Not recorded, so the export is retried once it is replaced
+                        failures += 1
+                        print(f"{input_file}: error: {e}", file=sys.stderr)
+                    else:
+                        ledger.record(content_hash, input_file, output_file)
+                
+                if once and not running and not watcher.pending:
+                    break
+                if running:
+                    # Check on the workers at least a few times a second
+                    watcher.wait(min(watcher.poll_seconds, 0.25))
+                else:
+                    watcher.wait()
+    except KeyboardInterrupt:
+        print("Stopped watching", file=sys.stderr)
+    finally:
+        watcher.close()
     
-    def apply_excel_formatting(self, output_file):
-        """
-        Apply formatting to the Excel file to match the example with merged cells for black bars
-        """
-        self.update_progress(80, "Applying Excel formatting...")
-        
-        # Load the workbook
-        wb = load_workbook(output_file)
-        ws = wb.active
-        
-        # Define styles
-        thin_border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
-        
-        black_fill = PatternFill(start_color="000000", end_color="000000", fill_type="solid")
-        
-        # Apply formatting to header row
-        for col in range(1, 5):  # A to D (VAN #, Client, Route Name & Day, Notes)
-            cell = ws.cell(row=1, column=col)
-            cell.border = thin_border
-            cell.font = Font(bold=True)
-            cell.alignment = Alignment(horizontal='center')
-        
-        # Apply borders to all cells and identify separator rows
-        max_row = ws.max_row
-        separator_rows = []
-        
-        for row in range(1, max_row + 1):
-            # Check if this is a separator row
-            day_cell = ws.cell(row=row, column=5)  # Column E contains the Day
-            
-            if day_cell.value and isinstance(day_cell.value, str) and day_cell.value.startswith("SEPARATOR_"):
-                separator_rows.append(row)
-            else:
-                # Apply borders to regular rows
-                for col in range(1, 5):  # A to D
-                    cell = ws.cell(row=row, column=col)
-                    cell.border = thin_border
-        
-        # Process separator rows - merge cells and apply black fill
-        for row in separator_rows:
-            # Merge cells A to D
-            ws.merge_cells(start_row=row, start_column=1, end_row=row, end_column=4)
-            
-            # Apply black fill to the merged cell
-            merged_cell = ws.cell(row=row, column=1)
-            merged_cell.fill = black_fill
-            
-            # Remove any text
-            merged_cell.value = ""
-            
-            # Remove borders from the merged cell
-            merged_cell.border = None
-        
-        # Hide the Day column (E)
-        ws.column_dimensions['E'].hidden = True
-        
-        # Set column widths to match the screenshot
-        ws.column_dimensions['A'].width = 10  # VAN #
-        ws.column_dimensions['B'].width = 30  # Client
-        ws.column_dimensions['C'].width = 40  # Route Name & Day
-        ws.column_dimensions['D'].width = 15  # Notes
-        
-        # Add a black bar at the top
-        ws.insert_rows(1)
-        ws.merge_cells(start_row=1, start_column=1, end_row=1, end_column=4)
-        top_bar = ws.cell(row=1, column=1)
-        top_bar.fill = black_fill
-        top_bar.border = None
+    return 1 if once and failures else 0
 
-        # Save the workbook
-        wb.save(output_file)
-        self.update_progress(90, "Finalizing...")
 
-    def update_progress(self, value, message=None):
-        """Update progress bar and status message"""
-        self.progress["value"] = value
-        if message:
-            self.status_var.set(message)
-        self.root.update_idletasks()
-    def process_route_data(self, report_file, output_file):
-        """
-        Main function to process route data
-        """
-        self.update_progress(0, "Starting...")
-        
-        client_data = self.extract_client_data(report_file)
-        client_data = self.match_clients_to_vans(client_data)
-        client_data = self.order_by_day_and_van(client_data)
-        formatted_data = self.format_output(client_data)
-        final_data = self.add_day_separators(formatted_data)
-        self.update_progress(75, f"Saving to {output_file}...")
-        final_data.to_excel(output_file, sheet_name='Sheet1', index=False)
+def build_arg_parser():
+    parser = argparse.ArgumentParser(
+        prog="birthday_bag_exporter",
+        description="Convert Client Track Happy Birthday label exports into route assignment workbooks. "
+                    "Run without arguments to start the GUI."
+    )
+    sources = parser.add_mutually_exclusive_group(required=True)
+    sources.add_argument(
+        "--input", "-i", nargs="+", metavar="FILE",
+        help="label export files or glob patterns such as 'exports/*.xlsx'"
+    )
+    sources.add_argument(
+        "--watch", "-w", metavar="DIR",
+        help="keep running and convert every export saved into DIR, once it has finished being written; "
+             "exports already converted are remembered across restarts"
+    )
+    sources.add_argument(
+        "--serve", type=int, nargs="?", const=DEFAULT_SERVICE_PORT, metavar="PORT",
+        help="run an HTTP service that converts exports POSTed to /convert and reports stage latencies "
+             f"on /metrics (default port: {DEFAULT_SERVICE_PORT})"
+    )
+    sources.add_argument(
+        "--alias", nargs=3, metavar=("DAY", "ALIAS", "ROUTE"),
+        help="save ALIAS in the route database as another name for the route ROUTE on DAY, then exit"
+    )
+    sources.add_argument(
+        "--remove-alias", nargs=2, metavar=("DAY", "ALIAS"),
+        help="remove an alias saved with --alias, then exit"
+    )
+    parser.add_argument(
+        "--output", "-o", metavar="PATH",
+        help=f"output workbook for a single input (default: {DEFAULT_OUTPUT_NAME}), "
+             "or a directory for several inputs (default: current directory) "
+             f"or a watched folder (default: a '{WATCH_OUTPUT_FOLDER}' folder next to it)"
+    )
+    parser.add_argument(
+        "--once", action="store_true",
+        help="with --watch, convert the exports already in the folder and exit"
+    )
+    parser.add_argument(
+        "--jobs", "-j", type=int, default=1, metavar="N",
+        help="number of files to process at once in separate processes (default: 1)"
+    )
+    parser.add_argument(
+        "--host", default="127.0.0.1",
+        help="with --serve, the address to listen on; use 0.0.0.0 to accept other machines (default: 127.0.0.1)"
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=DEFAULT_SERVICE_TIMEOUT, metavar="SECONDS",
+        help="with --serve, how long a request may take to upload or convert before it is "
+             f"abandoned (default: {DEFAULT_SERVICE_TIMEOUT:g})"
+    )
+    parser.add_argument(
+        "--trace", action="store_true",
+        help="also write a Chrome trace of the stage timings next to each output (<output>.trace.json)"
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="always parse the inputs instead of reusing tables cached by earlier runs"
+    )
+    parser.add_argument(
+        "--engine", choices=ENGINES, default='pandas',
+        help="'pandas' processes each stage as a table; 'records' streams labels through the stages "
+             "without building tables and does not use the cache (default: pandas)"
+    )
+    parser.add_argument(
+        "--routes-db", metavar="FILE",
+        help="SQLite database of route assignments (default: the one the GUI's route editor saves to)"
+    )
+    return parser
 
-        self.apply_excel_formatting(output_file)
 
-        self.update_progress(100, f"Done! Output saved to {output_file}")
-        return final_data
+def run_cli(argv):
+    """
+    Process label exports from the command line, without Tk. Returns the
+    exit status: 0 when every file was converted, 1 otherwise.
+    """
+    parser = build_arg_parser()
+    args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if args.once and not args.watch:
+        parser.error("--once requires --watch")
+    
+    if args.watch:
+        return run_cli_watch(parser, args)
+    if args.serve is not None:
+        return run_cli_serve(parser, args)
+    if args.alias or args.remove_alias:
+        return run_cli_alias(parser, args)
+    
+    try:
+        input_files = expand_input_paths(args.input)
+        output_files = plan_output_paths(input_files, args.output)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    
+    try:
+        route_assignments, route_aliases, word_aliases = RouteStore(args.routes_db).load()
+    except (OSError, sqlite3.Error) as e:
+        parser.error(f"Cannot read route assignments: {e}")
+    
+    trace_files = [trace_path_for(path) if args.trace else None for path in output_files]
+    
+    failures = 0
+    jobs = min(args.jobs, len(input_files))
+    if jobs == 1:
+        for input_file, output_file, trace_file in zip(input_files, output_files, trace_files):
+            try:
+                trace = process_route_file(input_file, output_file, route_assignments, trace_file,
+                                           use_cache=not args.no_cache, engine=args.engine, route_aliases=route_aliases,
+                                           word_aliases=word_aliases)
+                print(f"{input_file} -> {output_file} ({trace.summary()})")
+            except Exception as e:
+                failures += 1
+                print(f"{input_file}: error: {e}", file=sys.stderr)
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = {
+                pool.submit(process_route_file, input_file, output_file, route_assignments, trace_file,
+                            use_cache=not args.no_cache, engine=args.engine,
+                            route_aliases=route_aliases, word_aliases=word_aliases): (input_file, output_file)
+                for input_file, output_file, trace_file in zip(input_files, output_files, trace_files)
+            }
+            for future in as_completed(futures):
+                input_file, output_file = futures[future]
+                try:
+                    print(f"{input_file} -> {output_file} ({future.result().summary()})")
+                except Exception as e:
+                    failures += 1
+                    print(f"{input_file}: error: {e}", file=sys.stderr)
+    
+    return 1 if failures else 0
 
 
-def main():
+def run_cli_watch(parser, args):
+    """Run watch mode for run_cli"""
+    if not os.path.isdir(args.watch):
+        parser.error(f"No such directory: {args.watch}")
+    output_dir = args.output or watch_output_dir(args.watch)
+    if os.path.abspath(output_dir) == os.path.abspath(args.watch):
+        parser.error("--output must not be the watched folder")
+    
     try:
-        # Try to use TkinterDnD for drag and drop
-        root = TkinterDnD.Tk()
-    except Exception:
+        route_assignments, route_aliases, word_aliases = RouteStore(args.routes_db).load()
+    except (OSError, sqlite3.Error) as e:
+        parser.error(f"Cannot read route assignments: {e}")
+    
+    return run_watch(args.watch, output_dir, args.jobs, route_assignments, route_aliases, word_aliases,
+                     trace=args.trace, use_cache=not args.no_cache, engine=args.engine, once=args.once)
+
+
+def run_cli_alias(parser, args):
+    """Add or remove a route alias for run_cli"""
+    day = (args.alias or args.remove_alias)[0].upper()
+    if day not in DAY_ORDER:
+        parser.error(f"Unknown day {day}; expected one of {', '.join(DAY_ORDER)}")
+    
+    store = RouteStore(args.routes_db)
+    try:
+        if args.remove_alias:
+            alias = RouteStore.normalize(args.remove_alias[1])
+            if store.remove_alias(day, alias) is None:
+                parser.error(f"No alias {alias} on {day}")
+            print(f"Removed alias {alias} on {day}")
+            return 0
+        
+        _, alias, route = args.alias
+        route_assignments, _, _ = store.load()
+        # The alias points at the route as it is spelled in the assignments
+        routes = {RouteStore.normalize(key.split('_', 1)[1]): key.split('_', 1)[1]
+                  for key in route_assignments if key.startswith(f"{day}_")}
+        route = routes.get(RouteStore.normalize(route))
+        if route is None:
+            parser.error(f"No route {args.alias[2]} on {day}")
+        store.save_alias(day, alias, route)
+    except (OSError, sqlite3.Error) as e:
+        parser.error(f"Cannot update route aliases: {e}")
+    
+    print(f"{day} {RouteStore.normalize(alias)} -> {route}")
+    return 0
+
+
+def run_cli_serve(parser, args):
+    """Run the HTTP conversion service for run_cli"""
+    if args.timeout <= 0:
+        parser.error("--timeout must be positive")
+    
+    try:
+        route_assignments, route_aliases, word_aliases = RouteStore(args.routes_db).load()
+    except (OSError, sqlite3.Error) as e:
+        parser.error(f"Cannot read route assignments: {e}")
+    
+    # http.server is only needed here, so the GUI does not pay for importing it
+    from conversion_service import run_service
+    try:
+        return run_service(args.host, args.serve, route_assignments, route_aliases, word_aliases, engine=args.engine,
+                           jobs=args.jobs, timeout=args.timeout)
+    except OSError as e:
+        parser.error(f"Cannot listen on {args.host}:{args.serve}: {e}")
+
+
+def create_gui():
+    """
+    Create the main window and the app. The processing libraries and the
+    dependency check are left to app.finish_startup, once the window is up.
+    """
+    import_gui_modules()
+    root = None
+    if TkinterDnD is not None:
+        try:
+            # Try to use TkinterDnD for drag and drop
+            root = TkinterDnD.Tk()
+        except Exception:
+            pass
+    if root is None:
         # Fall back to regular Tk
         root = tk.Tk()
+    
+    return root, BirthdayBagExporter(root)
+
 
-    BirthdayBagExporter(root)
+def run_gui():
+    root, app = create_gui()
+    root.after_idle(app.finish_startup)
     root.mainloop()
 
 
+def main(argv=None):
+    """Run the command line converter when given arguments, otherwise the GUI"""
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv:
+        return run_cli(argv)
+    run_gui()
+    return 0
+
+
 if __name__ == "__main__":
-    main()
+    # Worker processes of a frozen executable start here too
+    multiprocessing.freeze_support()
+    sys.exit(main())
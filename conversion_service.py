@@ -0,0 +1,398 @@
+"""
+Local HTTP service that converts label exports for other machines, so the
+pandas and openpyxl start-up cost is paid once by long-lived workers
+instead of by every copy of the GUI.
+
+POST a label export to /convert and the formatted route workbook comes
+back as the response. GET /metrics reports request counts and per-stage
+latency histograms in the Prometheus text format, and GET /health answers
+"ok".
+
+Started by birthday_bag_exporter.py --serve; kept out of that module so
+the GUI does not import http.server on start-up.
+"""
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing import Manager
+from urllib.parse import parse_qs, urlsplit
+
+from birthday_bag_exporter import DEFAULT_OUTPUT_NAME, RouteDataProcessor, prewarm_imports
+
+# Upper bounds of the latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+# Largest export the service accepts
+MAX_UPLOAD_BYTES = 64 * 2 ** 20
+
+# How long a conversion waits for a free worker before it is turned away
+# with 503 Service Unavailable
+QUEUE_WAIT_SECONDS = 5.0
+
+# Requests handled at once for each worker: enough for one to convert, one
+# to upload or wait its turn, and a spare for /metrics and /health. Each can
+# hold an upload of up to MAX_UPLOAD_BYTES on disk; further connections wait
+# in the listen backlog until a handler is free.
+HANDLER_THREADS_PER_JOB = 2
+SPARE_HANDLER_THREADS = 2
+
+EXPORT_EXTENSIONS = ('.xlsx', '.xlsm', '.xls')
+
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# The processor of a worker process, kept between requests so the route
+# index and the routes it has already resolved stay warm
+worker_processor = None
+
+
+def init_worker(route_assignments, route_aliases, word_aliases, engine):
+    """Import the processing libraries and build the route index once per worker"""
+    global worker_processor
+    prewarm_imports()
+    worker_processor = RouteDataProcessor(route_assignments, engine=engine, route_aliases=route_aliases,
+                                          word_aliases=word_aliases)
+    worker_processor.route_index
+
+
+def worker_ready():
+    return os.getpid()
+
+
+def convert_in_worker(report_file, output_file, cancel_event):
+    """Run the pipeline in a worker process and return its stage timings"""
+    processor = worker_processor
+    processor.cancel_event = cancel_event
+    try:
+        processor.process_route_data(report_file, output_file)
+        return processor.last_trace
+    finally:
+        # Do not hold on to the last request's tables between requests
+        processor.cancel_event = None
+        processor.last_run = None
+        processor.route_matches = None
+
+
+class ServiceBusy(Exception):
+    """Every worker stayed busy for longer than the queue wait"""
+
+
+class ConversionTimeout(Exception):
+    """A conversion ran past the service's timeout and was cancelled"""
+
+
+class LatencyHistogram:
+    """Counts of durations per bucket, with their sum, for a Prometheus histogram"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        # One count per bucket plus one for durations above the last bound
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+    def lines(self, name, labels=""):
+        """Text format lines of the histogram, with cumulative buckets"""
+        prefix = f"{labels}," if labels else ""
+        lines = []
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            lines.append(f'{name}_bucket{{{prefix}le="{bound:g}"}} {total}')
+        lines.append(f'{name}_bucket{{{prefix}le="+Inf"}} {self.count}')
+        suffix = f"{{{labels}}}" if labels else ""
+        lines.append(f"{name}_sum{suffix} {self.sum:.6f}")
+        lines.append(f"{name}_count{suffix} {self.count}")
+        return lines
+
+
+class ServiceMetrics:
+    """Request and pipeline stage measurements, shared by the request threads"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # Stage name -> LatencyHistogram of its wall time
+        self.stages = {}
+        self.requests = LatencyHistogram()
+        # HTTP status -> number of conversion requests answered with it
+        self.responses = {}
+        self.in_progress = 0
+
+    def record_trace(self, tracer):
+        with self.lock:
+            for span in tracer.spans:
+                self.stages.setdefault(span.name, LatencyHistogram()).observe(span.wall)
+
+    def record_response(self, status, seconds):
+        with self.lock:
+            self.requests.observe(seconds)
+            self.responses[status] = self.responses.get(status, 0) + 1
+
+    def render(self):
+        """The metrics in the Prometheus text exposition format"""
+        with self.lock:
+            lines = [
+                "# HELP birthday_bag_stage_seconds Wall time of each pipeline stage.",
+                "# TYPE birthday_bag_stage_seconds histogram",
+            ]
+            for stage, histogram in self.stages.items():
+                lines += histogram.lines("birthday_bag_stage_seconds", f'stage="{stage}"')
+            lines += [
+                "# HELP birthday_bag_request_seconds Time to answer a conversion request, upload included.",
+                "# TYPE birthday_bag_request_seconds histogram",
+            ]
+            lines += self.requests.lines("birthday_bag_request_seconds")
+            lines += [
+                "# HELP birthday_bag_requests_total Conversion requests by HTTP status.",
+                "# TYPE birthday_bag_requests_total counter",
+            ]
+            lines += [f'birthday_bag_requests_total{{code="{status}"}} {count}'
+                      for status, count in sorted(self.responses.items())]
+            lines += [
+                "# HELP birthday_bag_conversions_in_progress Conversions currently running or waiting for a worker.",
+                "# TYPE birthday_bag_conversions_in_progress gauge",
+                f"birthday_bag_conversions_in_progress {self.in_progress}",
+            ]
+        return "\n".join(lines) + "\n"
+
+
+class ConversionService:
+    """
+    A pool of warm worker processes that convert exports on disk, at most
+    one per worker at a time. Conversions that find every worker busy
+    wait up to queue_wait seconds; conversions that run longer than
+    timeout seconds are cancelled.
+    """
+
+    def __init__(self, route_assignments, route_aliases, word_aliases, engine='pandas', jobs=1, timeout=120.0,
+                 queue_wait=QUEUE_WAIT_SECONDS):
+        self.jobs = jobs
+        self.timeout = timeout
+        self.queue_wait = queue_wait
+        self.metrics = ServiceMetrics()
+        # Released when a worker finishes, not when a request gives up, so a
+        # timed out conversion keeps its worker until it has stopped
+        self.slots = threading.BoundedSemaphore(jobs)
+        # Cancel events have to be shared with the worker processes
+        self.manager = Manager()
+        self.pool = ProcessPoolExecutor(
+            max_workers=jobs, initializer=init_worker,
+            initargs=(route_assignments, route_aliases, word_aliases, engine)
+        )
+
+    def warm_up(self):
+        """Start every worker now, rather than on the first requests"""
+        for future in [self.pool.submit(worker_ready) for _ in range(self.jobs)]:
+            future.result()
+
+    def convert(self, report_file, output_file):
+        """
+        Convert report_file into output_file and return the stage timings.
+        Raises ServiceBusy, ConversionTimeout or the pipeline's error.
+        """
+        if not self.slots.acquire(timeout=self.queue_wait):
+            raise ServiceBusy("Every worker is busy")
+
+        cancel_event = self.manager.Event()
+        try:
+            future = self.pool.submit(convert_in_worker, report_file, output_file, cancel_event)
+        except BaseException:
+            self.slots.release()
+            raise
+        future.add_done_callback(lambda _: self.slots.release())
+
+        try:
+            trace = future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            # The worker stops at its next cancellation check
+            cancel_event.set()
+            raise ConversionTimeout(f"Conversion took longer than {self.timeout:g}s") from None
+        self.metrics.record_trace(trace)
+        return trace
+
+    def close(self):
+        # Every submitted conversion holds a slot, so none are left queued
+        # behind the running ones
+        self.pool.shutdown(wait=True)
+        self.manager.shutdown()
+
+
+class ConversionRequestHandler(BaseHTTPRequestHandler):
+    server_version = "BirthdayBagExporter"
+
+    @property
+    def timeout(self):
+        """Socket timeout for reading requests, so stalled uploads do not hold a thread"""
+        return self.server.service.timeout
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        if path == '/metrics':
+            self.send_text(200, self.server.service.metrics.render(), "text/plain; version=0.0.4")
+        elif path == '/health':
+            self.send_text(200, "ok\n")
+        else:
+            self.send_text(404, "Not found\n")
+
+    def do_POST(self):
+        metrics = self.server.service.metrics
+        start = time.perf_counter()
+        with metrics.lock:
+            metrics.in_progress += 1
+        try:
+            status = self.convert_upload()
+        finally:
+            with metrics.lock:
+                metrics.in_progress -= 1
+        metrics.record_response(status, time.perf_counter() - start)
+
+    def convert_upload(self):
+        """Answer a conversion request and return the HTTP status sent"""
+        url = urlsplit(self.path)
+        if url.path not in ('/', '/convert'):
+            return self.send_text(404, "Not found\n")
+
+        length = self.headers.get('Content-Length', '')
+        if not length.isdigit():
+            self.close_connection = True
+            return self.send_text(411, "Content-Length is required\n")
+        length = int(length)
+        if length > MAX_UPLOAD_BYTES:
+            self.close_connection = True
+            return self.send_text(413, f"Exports larger than {MAX_UPLOAD_BYTES // 2 ** 20} MB are not accepted\n")
+
+        # ?filename=... names the export, which decides how it is read and
+        # what the workbook is called
+        filename = os.path.basename(parse_qs(url.query).get('filename', ['export.xlsx'])[0])
+        stem, extension = os.path.splitext(filename)
+        extension = extension.lower()
+        if extension not in EXPORT_EXTENSIONS:
+            self.close_connection = True
+            return self.send_text(415, f"Expected an {', '.join(EXPORT_EXTENSIONS)} export\n")
+
+        work_dir = tempfile.mkdtemp(prefix="birthday_bag_")
+        try:
+            report_file = os.path.join(work_dir, f"export{extension}")
+            output_file = os.path.join(work_dir, DEFAULT_OUTPUT_NAME)
+            try:
+                self.receive_upload(report_file, length)
+            except (socket.timeout, ConnectionError, EOFError):
+                self.close_connection = True
+                return self.send_text(408, "Timed out reading the export\n")
+
+            try:
+                trace = self.server.service.convert(report_file, output_file)
+            except ServiceBusy as e:
+                return self.send_text(503, f"{e}, try again shortly\n", headers={'Retry-After': '5'})
+            except ConversionTimeout as e:
+                return self.send_text(504, f"{e}\n")
+            except BrokenExecutor as e:
+                return self.send_text(500, f"Worker failed: {e}\n")
+            except Exception as e:
+                return self.send_text(422, f"Cannot convert {filename}: {e}\n")
+
+            self.send_workbook(output_file, f"{stem}_{DEFAULT_OUTPUT_NAME}", trace)
+            return 200
+        finally:
+            # A timed out worker may still have the files open, which stops
+            # them being removed on Windows
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    def receive_upload(self, path, length, chunk_size=2 ** 16):
+        with open(path, 'wb') as f:
+            remaining = length
+            while remaining:
+                chunk = self.rfile.read(min(chunk_size, remaining))
+                if not chunk:
+                    raise EOFError("Upload ended early")
+                f.write(chunk)
+                remaining -= len(chunk)
+
+    def send_workbook(self, path, filename, trace):
+        """Stream the finished workbook back in chunks"""
+        self.send_response(200)
+        self.send_header('Content-Type', XLSX_CONTENT_TYPE)
+        self.send_header('Content-Length', str(os.path.getsize(path)))
+        self.send_header('Content-Disposition', f'attachment; filename="{filename}"')
+        self.send_header('X-Stage-Timings', trace.summary())
+        self.end_headers()
+        with open(path, 'rb') as f:
+            shutil.copyfileobj(f, self.wfile, 2 ** 16)
+
+    def send_text(self, status, text, content_type="text/plain; charset=utf-8", headers=None):
+        body = text.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+        return status
+
+
+class ConversionServer(ThreadingHTTPServer):
+    """
+    HTTP server with a thread per connection, at most handler_threads at
+    a time. Threads only move bytes and wait; the conversions themselves
+    are bounded by the service's workers.
+    """
+
+    daemon_threads = True
+    # Let bursts of connections queue instead of being refused
+    request_queue_size = 64
+
+    def __init__(self, address, service, handler_threads):
+        self.service = service
+        # Taken before a connection is given a thread and released
+        # when its thread ends, so the accept loop waits while all are busy
+        self.handler_slots = threading.BoundedSemaphore(handler_threads)
+        super().__init__(address, ConversionRequestHandler)
+
+    def process_request(self, request, client_address):
+        self.handler_slots.acquire()
+        try:
+            super().process_request(request, client_address)
+        except BaseException:
+            self.handler_slots.release()
+            raise
+
+    def process_request_thread(self, request, client_address):
+        try:
+            super().process_request_thread(request, client_address)
+        finally:
+            self.handler_slots.release()
+
+
+def run_service(host, port, route_assignments, route_aliases, word_aliases, engine='pandas', jobs=1, timeout=120.0):
+    """Serve conversions until interrupted and return the exit status"""
+    service = ConversionService(route_assignments, route_aliases, word_aliases, engine=engine, jobs=jobs,
+                                timeout=timeout)
+    try:
+        server = ConversionServer((host, port), service, HANDLER_THREADS_PER_JOB * jobs + SPARE_HANDLER_THREADS)
+    except OSError:
+        service.close()
+        raise
+
+    try:
+        service.warm_up()
+        print(f"Serving on http://{host}:{server.server_port}/convert with {jobs} worker(s)", file=sys.stderr)
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("Stopped serving", file=sys.stderr)
+    finally:
+        server.server_close()
+        service.close()
+    return 0
@@ -7,7 +7,7 @@ REM Check if Python is installed
 python --version > nul 2>&1
 if %errorlevel% neq 0 (
     echo Python is not installed or not in PATH.
-    echo Please install Python 3.6 or higher from https://www.python.org/downloads/
+    echo Please install Python 3.7 or higher from https://www.python.org/downloads/
     echo Make sure to check "Add Python to PATH" during installation.
     echo.
     pause
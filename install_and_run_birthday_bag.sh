@@ -7,7 +7,7 @@ echo
 # Check if Python is installed
 if ! command -v python3 &> /dev/null; then
     echo "Python 3 is not installed or not in PATH."
-    echo "Please install Python 3.6 or higher from https://www.python.org/downloads/"
+    echo "Please install Python 3.7 or higher from https://www.python.org/downloads/"
     echo "or use your system's package manager."
     echo
     read -p "Press Enter to exit..."
@@ -0,0 +1,72 @@
+"""
+Route matching through the word aliases must only ever add matches to the
+ones the route assignments give on their own.
+"""
+import os
+import sys
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from birthday_bag_exporter import (  # noqa: E402
+    DAY_ORDER, DEFAULT_ROUTE_ASSIGNMENTS, DEFAULT_WORD_ALIASES, RouteDataProcessor, RouteIndex,
+)
+
+
+class WordAliasMatchingTest(unittest.TestCase):
+    def test_canonical_spelling_wins_over_alias(self):
+        processor = RouteDataProcessor({'MON_CANYON CNTRY-1': '1', 'MON_CANYON COUNTRY-1': '5'})
+        self.assertEqual(processor.resolve_route('MON | CANYON COUNTRY-1'), '5')
+
+    def test_exact_key_as_entered_wins(self):
+        processor = RouteDataProcessor({'MON_CANYON COUNTRY-1': '5', 'MON_CANYON CNTRY-1': '1'})
+        self.assertEqual(processor.resolve_route('MON | CANYON CNTRY-1'), '1')
+
+    def test_alias_spelling_resolves(self):
+        processor = RouteDataProcessor({'MON_CANYON CNTRY-1': '1'})
+        self.assertEqual(processor.resolve_route('MON | Canyon Country-1'), '1')
+
+    def test_partial_match_on_entered_spelling(self):
+        processor = RouteDataProcessor(dict(DEFAULT_ROUTE_ASSIGNMENTS))
+        self.assertEqual(processor.resolve_route('TUE | NOH'), 'VOLUNTEER-1')
+
+    def test_aliases_only_add_matches(self):
+        with_aliases = RouteDataProcessor(dict(DEFAULT_ROUTE_ASSIGNMENTS))
+        without_aliases = RouteDataProcessor(dict(DEFAULT_ROUTE_ASSIGNMENTS), word_aliases={})
+        for key in DEFAULT_ROUTE_ASSIGNMENTS:
+            day, route = key.split('_', 1)
+            base = route.split('-')[0]
+            for name in (route, route.lower(), base, f"{base}-9", route[:3], f"X {route}"):
+                route_line = f"{day} | {name}"
+                if without_aliases.resolve_route(route_line):
+                    self.assertTrue(with_aliases.resolve_route(route_line), route_line)
+
+
+class RouteIndexBuildTest(unittest.TestCase):
+    def setUp(self):
+        processor = RouteDataProcessor({})
+        self.extract_route_base = processor.extract_route_base
+        self.route_assignments = {
+            f"{DAY_ORDER[number % len(DAY_ORDER)]}_NORTH HOLLYWOOD CNTRY ROUTE {number}-{number % 4}": str(number % 30)
+            for number in range(1000)
+        }
+
+    def test_builds_large_table_quickly(self):
+        start = time.perf_counter()
+        RouteIndex(self.route_assignments, self.extract_route_base, word_aliases=DEFAULT_WORD_ALIASES)
+        self.assertLess(time.perf_counter() - start, 0.1)
+
+    def test_key_search_finds_earliest_key(self):
+        index = RouteIndex(self.route_assignments, self.extract_route_base, word_aliases=DEFAULT_WORD_ALIASES)
+        # Route 71 is the eleventh on MON, before route 701
+        self.assertEqual(index.first_key_containing('MON', 'ROUTE 7'), 10)
+        # Both spellings of every key are searched
+        self.assertEqual(index.first_key_containing('MON', 'CNTRY ROUTE 701-'), 100)
+        self.assertEqual(index.first_key_containing('MON', 'COUNTRY ROUTE 701-'), 100)
+        # A match may not run from one key into the next
+        self.assertIsNone(index.first_key_containing('MON', '-1\nMON_'))
+
+
+if __name__ == "__main__":
+    unittest.main()